@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import contextlib
+import logging
+import os
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config
+from benchmarks.stub_server import serve
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures the cost of debug output on large incident listings")
+    parser.add_argument("-n", "--number", type=int, default=30, help="Pages fetched per measurement")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Measurements, of which the fastest is reported")
+    parser.add_argument("-s", "--page-size", type=int, default=20, help="Incidents per page")
+    args = parser.parse_args()
+
+    server = serve(pages=args.number, incident_sizes={"units": 5, "comments": 5, "exposures": 5, "casualty_rescues": 5})
+    devnull = open(os.devnull, "w")
+    logging.getLogger("neris_api_client").addHandler(logging.StreamHandler(devnull))
+    logging.getLogger("neris_api_client").propagate = False
+
+    for name, debug, sample_rate in [("debug off", False, 1.0), ("debug, 1% sampled", True, 0.01), ("debug, every request", True, 1.0)]:
+        client = NerisApiClient(
+            Config(
+                base_url=server.base_url,
+                grant_type="client_credentials",
+                client_id="bench",
+                client_secret="bench",
+                debug=debug,
+                debug_sample_rate=sample_rate,
+            )
+        )
+        client.health()  # fetch the first token outside of the measurement
+        client.list_incidents("FD00000000", page_size=args.page_size)
+
+        best = float("inf")
+        with contextlib.redirect_stdout(devnull):
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for page in range(args.number):
+                    client.list_incidents("FD00000000", cursor=str(page), page_size=args.page_size)
+                best = min(best, time.perf_counter() - start)
+
+        print(f"{name:22s} {best / args.number * 1000:7.2f} ms per page")
+        client.close()
+
+    server.shutdown()
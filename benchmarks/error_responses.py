@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+import contextlib
+import io
+import sys
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config, NerisApiError
+from benchmarks.stub_server import serve
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures the cost of calls answered with an error status")
+    parser.add_argument("-n", "--number", type=int, default=2000, help="Calls made")
+    parser.add_argument("-s", "--status", type=int, default=422, help="Status the server answers with")
+    parser.add_argument("--tty", action="store_true", help="Leave stdout attached to the terminal instead of capturing it")
+    args = parser.parse_args()
+
+    server = serve(error_status=args.status)
+    client = NerisApiClient(
+        Config(base_url=server.base_url, grant_type="client_credentials", client_id="bench", client_secret="bench")
+    )
+
+    stdout = io.StringIO()
+    errors = 0
+    start = time.perf_counter()
+
+    with contextlib.nullcontext() if args.tty else contextlib.redirect_stdout(stdout):
+        for _ in range(args.number):
+            try:
+                got = client.get_entity("FD24027240")
+            except NerisApiError:
+                errors += 1
+            else:
+                errors += not isinstance(got, dict)  # clients that returned the failed response
+
+    elapsed = time.perf_counter() - start
+    print(f"{errors} errors in {elapsed:6.2f} s, {elapsed / args.number * 1e6:6.0f} us per call, {len(stdout.getvalue())} bytes printed", file=sys.stderr)
+
+    client.close()
+    server.shutdown()
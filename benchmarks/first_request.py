@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+
+SETUP = (
+    "from src.neris_api_client import NerisApiClient, Config\n"
+    "from benchmarks.payloads import incident\n"
+    "client = NerisApiClient(Config(base_url='http://localhost', grant_type='client_credentials', client_id='id', client_secret='secret'))\n"
+    "patch = {'neris_id': 'FD12345678|abc123xyz|1729023498', 'action': 'patch', 'properties': {}}\n"
+    "body = incident()\n"
+)
+
+ENCODE = (
+    "client._encode_body(patch, 'patch_incident')\n"
+    "client._encode_body(body, 'create_incident')"
+)
+
+
+def measure(warmup: bool, runs: int) -> float:
+    """Median wall time in seconds of encoding the first patch and incident bodies in a fresh interpreter."""
+    code = (
+        "import time\n"
+        f"{SETUP}"
+        f"{'client.warmup()' if warmup else ''}\n"
+        "start = time.perf_counter()\n"
+        f"{ENCODE}\n"
+        "print(time.perf_counter() - start)"
+    )
+
+    return statistics.median(
+        float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+        for _ in range(runs)
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures the latency of the first validated request bodies with and without warmup")
+    parser.add_argument("-r", "--runs", type=int, default=10, help="Fresh interpreters per scenario")
+    args = parser.parse_args()
+
+    for name, warmup in [("cold", False), ("after client.warmup()", True)]:
+        print(f"{name:24s} {measure(warmup, args.runs) * 1000:8.1f} ms")
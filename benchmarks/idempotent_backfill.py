@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config, MemoryLedger
+from benchmarks.payloads import incident
+from benchmarks.stub_server import serve
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Replays a backfill of incidents, as after a crash, with and without a ledger")
+    parser.add_argument("-n", "--incidents", type=int, default=200, help="Incidents backfilled")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("-l", "--latency", type=float, default=0.05, help="Server latency per request in seconds")
+    args = parser.parse_args()
+
+    bodies = [incident(i, units=5, comments=5, exposures=2, casualty_rescues=2) for i in range(args.incidents)]
+    server = serve(latency=args.latency, dedupe=True)
+
+    ledger = MemoryLedger()
+
+    def make_client(ledger: MemoryLedger | None) -> NerisApiClient:
+        client = NerisApiClient(
+            Config(base_url=server.base_url, grant_type="client_credentials", client_id="bench", client_secret="bench", ledger=ledger)
+        )
+        client.health()  # fetch the first token outside of the measurement
+        return client
+
+    for name, client in [("backfill", make_client(ledger)), ("replay, no ledger", make_client(None)), ("replay, ledger", make_client(ledger))]:
+        writes, start = server.writes, time.perf_counter()
+        results = list(client.create_incidents("FD24027240", bodies, concurrency=args.concurrency))
+        elapsed = time.perf_counter() - start
+        ok = sum(result.ok for result in results)
+        print(f"{name:18s} {ok:4d}/{len(results)} ok, {server.writes - writes:4d} requests in {elapsed:6.2f} s")
+
+        client.close()
+
+    server.shutdown()
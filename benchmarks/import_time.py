@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+import statistics
+import subprocess
+import sys
+from argparse import ArgumentParser
+
+
+SCENARIOS = {
+    "import neris_api_client": "import src.neris_api_client",
+    "import neris_api_client.models": "import src.neris_api_client.models",
+    "first IncidentPayload validation": (
+        "import src.neris_api_client.models as models\n"
+        "try:\n"
+        "    models.IncidentPayload.model_validate({})\n"
+        "except Exception:\n"
+        "    pass"
+    ),
+}
+
+
+def measure(statement: str, runs: int) -> float:
+    """Median wall time in seconds of running `statement` in a fresh interpreter."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)"
+    )
+
+    return statistics.median(
+        float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+        for _ in range(runs)
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures cold import time of the client and its models")
+    parser.add_argument("-r", "--runs", type=int, default=10, help="Fresh interpreters per scenario")
+    args = parser.parse_args()
+
+    for name, statement in SCENARIOS.items():
+        print(f"{name:36s} {measure(statement, args.runs) * 1000:8.1f} ms")
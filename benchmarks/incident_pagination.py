@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config
+from benchmarks.stub_server import serve
+
+
+def serial(client: NerisApiClient, page_size: int, work: float) -> int:
+    count, cursor = 0, None
+
+    while True:
+        page = client.list_incidents("FD00000000", cursor=cursor, page_size=page_size)
+        for _ in page["incidents"]:
+            time.sleep(work)
+            count += 1
+
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return count
+
+
+def prefetched(client: NerisApiClient, page_size: int, work: float) -> int:
+    count = 0
+
+    for _ in client.iter_incidents("FD00000000", page_size=page_size):
+        time.sleep(work)
+        count += 1
+
+    return count
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares a hand-rolled cursor loop against iter_incidents with prefetching")
+    parser.add_argument("-p", "--pages", type=int, default=20, help="Pages in the listing")
+    parser.add_argument("-s", "--page-size", type=int, default=50, help="Incidents per page")
+    parser.add_argument("-l", "--latency", type=float, default=0.1, help="Server latency per page in seconds")
+    parser.add_argument("-w", "--work", type=float, default=0.002, help="Seconds spent processing each incident")
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency, pages=args.pages)
+    client = NerisApiClient(
+        Config(base_url=server.base_url, grant_type="client_credentials", client_id="bench", client_secret="bench")
+    )
+    client.health()  # fetch the first token outside of the measurement
+
+    for name, fn in [("cursor loop", serial), ("iter_incidents", prefetched)]:
+        start = time.perf_counter()
+        count = fn(client, args.page_size, args.work)
+        print(f"{name:16s} {count:6d} incidents in {time.perf_counter() - start:6.2f} s")
+
+    client.close()
+    server.shutdown()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+import copy
+import json
+import timeit
+from argparse import ArgumentParser
+
+from src.neris_api_client import diff_incident
+from src.neris_api_client.models import IncidentPayload
+from benchmarks.payloads import incident, incident_response
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares sending a whole incident against a patch computed by diff_incident")
+    parser.add_argument("-n", "--number", type=int, default=20, help="Diffs per measurement")
+    parser.add_argument("-s", "--scale", type=int, default=50, help="Exposures, casualty rescues and comments per incident")
+    args = parser.parse_args()
+
+    sizes = {"exposures": args.scale, "casualty_rescues": args.scale, "comments": args.scale}
+    # The incident as the API returned it, as JSON, with neris_uids on list elements
+    old = incident_response(**sizes)
+
+    # Diffing an incident against itself, in the form it was submitted in, must not patch anything
+    unchanged = diff_incident(old, incident(**sizes)).model_dump(exclude_none=True)["properties"]
+    assert not unchanged, f"unchanged incident patches {', '.join(unchanged)}"
+
+    # A typical CAD update: a unit clears, a comment is added and the outcome narrative is written
+    changed = copy.deepcopy(incident(**sizes))
+    changed["dispatch"]["unit_responses"][3]["unit_clear"] = "2024-06-14T00:30:00+00:00"
+    changed["dispatch"]["comments"].append({"comment": "All units clear", "timestamp": "2024-06-14T00:31:00+00:00"})
+    changed["base"]["outcome_narrative"] = "Fire extinguished, scene turned over to owner."
+    new = IncidentPayload.model_validate(changed)
+
+    patch = diff_incident(old, new)
+    full = new.model_dump_json(by_alias=True, exclude_none=True)
+    patched = patch.model_dump_json(by_alias=True, exclude_none=True)
+
+    print(f"whole incident:  {len(full) / 1024:8.1f} KiB")
+    print(f"patch:           {len(patched) / 1024:8.1f} KiB")
+    print(f"changed:         {', '.join(json.loads(patched)['properties'])}")
+
+    best = min(timeit.repeat(lambda: diff_incident(old, new), number=args.number, repeat=5)) / args.number
+    print(f"diff_incident:   {best * 1000:8.2f} ms")
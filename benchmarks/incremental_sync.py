@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+import time
+from argparse import ArgumentParser
+from datetime import timedelta
+from typing import Any, List
+
+from src.neris_api_client import NerisApiClient, Config, IncidentSink, IncidentSync, MemorySyncState
+from benchmarks.stub_server import EPOCH, serve
+
+
+class CountingSink(IncidentSink):
+    def __init__(self):
+        self.count = 0
+
+    def upsert(self, neris_id_entity: str, incidents: List[Any]) -> None:
+        self.count += len(incidents)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares a full pull of an entity's incidents against an incremental sync of a day's changes")
+    parser.add_argument("-p", "--pages", type=int, default=50, help="Pages of incidents held by the entity")
+    parser.add_argument("-s", "--page-size", type=int, default=100, help="Incidents per page")
+    parser.add_argument("-d", "--delta", type=int, default=120, help="Incidents modified since the last sync")
+    parser.add_argument("-l", "--latency", type=float, default=0.05, help="Server latency per page in seconds")
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency, pages=args.pages)
+    client = NerisApiClient(
+        Config(base_url=server.base_url, grant_type="client_credentials", client_id="bench", client_secret="bench")
+    )
+    client.health()  # fetch the first token outside of the measurement
+
+    # The stub modifies one incident a minute, so this mark leaves `delta` incidents to sync. The stub
+    # honors `last_modified_start`, which the real API may not, so this measures the client side only
+    last_night = MemorySyncState()
+    last_night.save("FD00000000", EPOCH + timedelta(minutes=args.pages * args.page_size - args.delta))
+
+    for name, state in [("full pull", MemorySyncState()), ("incremental", last_night)]:
+        sink = CountingSink()
+        start = time.perf_counter()
+        result = IncidentSync(client, sink, state, page_size=args.page_size).run("FD00000000")
+        print(f"{name:12s} {sink.count:6d} incidents in {time.perf_counter() - start:6.2f} s, mark {result.high_water_mark}")
+
+    client.close()
+    server.shutdown()
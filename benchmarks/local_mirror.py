@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config, LocalMirror
+from benchmarks.stub_server import serve
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares resolving unit metadata with get_entity against a LocalMirror lookup")
+    parser.add_argument("-p", "--pages", type=int, default=5, help="Pages of entities listed by the API")
+    parser.add_argument("-n", "--number", type=int, default=200, help="Lookups per measurement")
+    parser.add_argument("-l", "--latency", type=float, default=0.02, help="Server latency per request in seconds")
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency, pages=args.pages)
+    client = NerisApiClient(
+        Config(base_url=server.base_url, grant_type="client_credentials", client_id="bench", client_secret="bench", pool_maxsize=8)
+    )
+    client.health()  # fetch the first token outside of the measurement
+
+    mirror = LocalMirror(client)
+    start = time.perf_counter()
+    changed = mirror.refresh(concurrency=8)
+    print(f"initial refresh     {changed:6d} entities in {time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    changed = mirror.refresh(concurrency=8)
+    print(f"unchanged refresh   {changed:6d} entities in {time.perf_counter() - start:8.2f} s")
+
+    start = time.perf_counter()
+    for _ in range(args.number):
+        units = [unit for station in client.get_entity("FD00000001")["stations"] for unit in station["units"]]
+    print(f"get_entity          {(time.perf_counter() - start) / args.number * 1e6:10.1f} us per lookup")
+
+    for name, lookup in [
+        ("mirror.unit", lambda: mirror.unit("FD00000001S001U002")),
+        ("mirror.units(type)", lambda: mirror.units(type="LADDER_TALL", neris_id_entity="FD00000001")),
+        ("mirror.stations", lambda: mirror.stations("FD00000001")),
+    ]:
+        start = time.perf_counter()
+        for _ in range(args.number * 10):
+            lookup()
+        print(f"{name:19s} {(time.perf_counter() - start) / (args.number * 10) * 1e6:10.1f} us per lookup")
+
+    mirror.close()
+    client.close()
+    server.shutdown()
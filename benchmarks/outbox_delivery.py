@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config, Outbox, RetryPolicy
+from benchmarks.payloads import incident
+from benchmarks.stub_server import serve
+
+
+def make_client(base_url: str) -> NerisApiClient:
+    return NerisApiClient(
+        Config(
+            base_url=base_url,
+            grant_type="client_credentials",
+            client_id="bench",
+            client_secret="bench",
+            retry=RetryPolicy(total=0, backoff_factor=0.05, backoff_max=0.2),
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares submitting incidents directly against an Outbox, including across an outage and a restart")
+    parser.add_argument("-n", "--incidents", type=int, default=200, help="Incidents submitted")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Deliveries in flight")
+    parser.add_argument("-l", "--latency", type=float, default=0.05, help="Server latency per request in seconds")
+    args = parser.parse_args()
+
+    bodies = [incident(i, units=5, comments=5, exposures=2, casualty_rescues=2) for i in range(args.incidents)]
+    server = serve(latency=args.latency)
+    client = make_client(server.base_url)
+    client.health()  # fetch the first token outside of the measurement
+
+    start = time.perf_counter()
+    for body in bodies:
+        client.create_incident("FD24027240", body)
+    print(f"create_incident   {args.incidents} accepted in {time.perf_counter() - start:6.2f} s")
+
+    path = os.path.join(tempfile.mkdtemp(), "outbox.db")
+
+    with Outbox(client, path, concurrency=args.concurrency) as outbox:
+        start = time.perf_counter()
+        for body in bodies:
+            outbox.create_incident("FD24027240", body)
+        accepted = time.perf_counter() - start
+        outbox.drain()
+        print(f"Outbox            {args.incidents} accepted in {accepted:6.2f} s, delivered in {time.perf_counter() - start:6.2f} s")
+
+    # While the API is unreachable submissions are kept, and a new process delivers them once it is back
+    os.remove(path)
+    offline = make_client("http://127.0.0.1:9")
+    offline.tokens = client.tokens
+    with Outbox(offline, path) as outbox:
+        for body in bodies:
+            outbox.create_incident("FD24027240", body)
+        time.sleep(0.5)
+        print(f"during outage     {outbox.pending} pending")
+
+    with Outbox(client, path, concurrency=args.concurrency) as outbox:
+        start = time.perf_counter()
+        outbox.drain()
+        print(f"after restart     {outbox.pending} pending, delivered in {time.perf_counter() - start:6.2f} s")
+
+    client.close()
+    server.shutdown()
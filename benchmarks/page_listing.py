@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config
+from benchmarks.stub_server import serve
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures walking a page-numbered entity listing with increasing concurrency")
+    parser.add_argument("-p", "--pages", type=int, default=40, help="Pages in the listing")
+    parser.add_argument("-s", "--page-size", type=int, default=100, help="Entities per page")
+    parser.add_argument("-l", "--latency", type=float, default=0.1, help="Server latency per page in seconds")
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency, pages=args.pages)
+
+    for concurrency in [1, 4, 8, 16]:
+        client = NerisApiClient(
+            Config(
+                base_url=server.base_url,
+                grant_type="client_credentials",
+                client_id="bench",
+                client_secret="bench",
+                pool_maxsize=concurrency,
+            )
+        )
+        client.health()  # fetch the first token outside of the measurement
+
+        start = time.perf_counter()
+        count = sum(1 for _ in client.iter_entities(page_size=args.page_size, concurrency=concurrency))
+        print(f"concurrency {concurrency:3d}: {count:6d} entities in {time.perf_counter() - start:6.2f} s")
+
+        client.close()
+
+    server.shutdown()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import copy
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config, PatchQueue, diff_incident
+from benchmarks.payloads import as_response, incident
+from benchmarks.stub_server import serve
+
+NERIS_ID_ENTITY = "FD24027240"
+
+
+def cad_updates(incidents: int, updates: int):
+    """Patches as a CAD emits them during active incidents: a unit time, then a comment, then the narrative, and so on."""
+    payload = incident(units=updates, comments=5, exposures=2, casualty_rescues=2)
+    old = as_response(payload)
+
+    patches = []
+    for update in range(updates):
+        new = copy.deepcopy(payload)
+        match update % 3:
+            case 0:
+                new["dispatch"]["unit_responses"][update]["unit_clear"] = "2024-06-14T00:30:00+00:00"
+            case 1:
+                new["dispatch"]["comments"].append({"comment": f"Update {update}", "timestamp": "2024-06-14T00:31:00+00:00"})
+            case 2:
+                new["base"]["outcome_narrative"] = f"Narrative revision {update}"
+        patches.append(diff_incident(old, new))
+
+    # Updates for different incidents arrive interleaved
+    return [(f"INC{i}", patch) for patch in patches for i in range(incidents)]
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares one patch_incident call per CAD update against a coalescing PatchQueue")
+    parser.add_argument("-i", "--incidents", type=int, default=20, help="Active incidents")
+    parser.add_argument("-u", "--updates", type=int, default=9, help="Updates per incident")
+    parser.add_argument("-w", "--window", type=float, default=0.5, help="Coalescing window in seconds")
+    parser.add_argument("-l", "--latency", type=float, default=0.02, help="Server latency per request in seconds")
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency)
+    client = NerisApiClient(
+        Config(base_url=server.base_url, grant_type="client_credentials", client_id="bench", client_secret="bench")
+    )
+    client.health()  # fetch the first token outside of the measurement
+
+    updates = cad_updates(args.incidents, args.updates)
+
+    writes, start = server.writes, time.perf_counter()
+    for neris_id_incident, patch in updates:
+        client.patch_incident(NERIS_ID_ENTITY, neris_id_incident, patch)
+    print(f"patch_incident  {server.writes - writes:5d} requests in {time.perf_counter() - start:6.2f} s")
+
+    writes, start = server.writes, time.perf_counter()
+    with PatchQueue(client, window=args.window) as queue:
+        for neris_id_incident, patch in updates:
+            queue.submit(NERIS_ID_ENTITY, neris_id_incident, patch)
+    print(f"PatchQueue      {server.writes - writes:5d} requests in {time.perf_counter() - start:6.2f} s")
+
+    client.close()
+    server.shutdown()
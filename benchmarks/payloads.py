@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+import itertools
+from typing import Any, Dict, Iterator
+
+
+def location(number: int) -> Dict[str, Any]:
+    return {
+        "number": str(number),
+        "street": "Main",
+        "street_postfix": "STREET",
+        "incorporated_municipality": "Springfield",
+        "county": "Sangamon",
+        "state": "IL",
+        "postal_code": "62701",
+        "country": "US",
+    }
+
+
+def incident(index: int = 0, units: int = 20, comments: int = 50, exposures: int = 50, casualty_rescues: int = 50) -> Dict[str, Any]:
+    """A valid IncidentPayload of realistic shape, scaled by the number of repeated sub-records."""
+    call_create = datetime(2024, 6, 13, 21, 14, 2, tzinfo=timezone.utc) + timedelta(minutes=index)
+
+    return {
+        "base": {
+            "department_neris_id": "FD24027214",
+            "incident_number": f"2024-{index:06d}",
+            "location": location(index),
+            "people_present": True,
+            "displacement_count": 2,
+            "outcome_narrative": "Crews arrived to find smoke showing from a two story residence. " * 5,
+        },
+        "incident_types": [{"type": "FIRE||STRUCTURE_FIRE||ROOM_AND_CONTENTS_FIRE", "primary": True}],
+        "dispatch": {
+            "incident_number": f"D-2024-{index:06d}",
+            "call_arrival": call_create.isoformat(),
+            "call_answered": (call_create + timedelta(seconds=5)).isoformat(),
+            "call_create": (call_create + timedelta(seconds=30)).isoformat(),
+            "location": location(index),
+            "comments": [
+                {"comment": f"Update {i}: crews operating on floor {i % 3 + 1}", "timestamp": (call_create + timedelta(minutes=i)).isoformat()}
+                for i in range(comments)
+            ],
+            "unit_responses": [
+                {
+                    "reported_unit_id": f"E{i}",
+                    "staffing": 4,
+                    "dispatch": (call_create + timedelta(seconds=60)).isoformat(),
+                    "enroute_to_scene": (call_create + timedelta(seconds=90)).isoformat(),
+                    "on_scene": (call_create + timedelta(minutes=6)).isoformat(),
+                    "unit_clear": (call_create + timedelta(hours=2)).isoformat(),
+                }
+                for i in range(units)
+            ],
+        },
+        "exposures": [
+            {
+                "location_detail": {"type": "EXTERNAL_EXPOSURE"},
+                "location": location(index + i + 1),
+                "damage_type": "MINOR_DAMAGE",
+                "people_present": False,
+            }
+            for i in range(exposures)
+        ],
+        "casualty_rescues": [
+            {"type": "NONFF" if i % 2 else "FF", "rank": "Captain" if i % 2 == 0 else None, "years_of_service": 12}
+            for i in range(casualty_rescues)
+        ],
+    }
+
+
+def _stamp(value: Any, last_modified: str, uids: Iterator[int]) -> Any:
+    if isinstance(value, dict):
+        return {**{k: _stamp(v, last_modified, uids) for k, v in value.items()}, "last_modified": last_modified}
+
+    # The API numbers the elements of lists with a neris_uid
+    if isinstance(value, list):
+        return [{**_stamp(v, last_modified, uids), "neris_uid": next(uids)} if isinstance(v, dict) else v for v in value]
+
+    return value
+
+
+def as_response(payload: Dict[str, Any], index: int = 0) -> Dict[str, Any]:
+    """An incident payload as the API returns it once created."""
+    got = _stamp(payload, "2024-06-14T00:00:00+00:00", itertools.count(1))
+    got["neris_id"] = f"FD24027240|INC{index:06d}|1718323200"
+
+    return got
+
+
+def incident_response(index: int = 0, **sizes: int) -> Dict[str, Any]:
+    """An `IncidentResponse` as the API returns it for `incident(index, **sizes)`."""
+    return as_response(incident(index, **sizes), index)
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config, ResponseCache
+from benchmarks.stub_server import serve
+
+
+def run(base_url: str, cache: ResponseCache | None, number: int) -> str:
+    client = NerisApiClient(
+        Config(base_url=base_url, grant_type="client_credentials", client_id="bench", client_secret="bench", cache=cache)
+    )
+    client.health()  # fetch the first token outside of the measurement
+
+    start = time.perf_counter()
+    for _ in range(number):
+        client.get_entity("FD00000001")
+    elapsed = time.perf_counter() - start
+
+    client.close()
+    stats = f", {cache.stats.hits} hits, {cache.stats.misses} misses, {cache.stats.revalidated} revalidated" if cache else ""
+    return f"{elapsed / number * 1000:7.2f} ms per call{stats}"
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares repeated get_entity calls with and without the response cache")
+    parser.add_argument("-n", "--number", type=int, default=100, help="Calls per scenario")
+    parser.add_argument("-s", "--stations", type=int, default=200, help="Stations in the entity payload")
+    parser.add_argument("-l", "--latency", type=float, default=0.02, help="Server latency per request in seconds")
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency, stations=args.stations)
+    etag_server = serve(latency=args.latency, stations=args.stations, etags=True)
+
+    print(f"no cache:             {run(server.base_url, None, args.number)}")
+    print(f"cache, TTL only:      {run(server.base_url, ResponseCache(ttl=60), args.number)}")
+    print(f"cache, ETag:          {run(etag_server.base_url, ResponseCache(ttl=60), args.number)}")
+
+    server.shutdown()
+    etag_server.shutdown()
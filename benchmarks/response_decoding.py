@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+import json
+import timeit
+from argparse import ArgumentParser
+
+from src.neris_api_client.endpoints import Endpoint
+from src.neris_api_client.models import ListIncidentsResponse
+from src.neris_api_client.responses import decode_response
+from benchmarks.payloads import incident_response
+
+ENDPOINT = Endpoint(response_model="ListIncidentsResponse")
+
+
+def via_dict(content: bytes) -> None:
+    page = ListIncidentsResponse.model_validate(json.loads(content))
+    for incident in page.incidents:
+        incident.neris_id, incident.base, incident.dispatch
+
+
+def model(content: bytes) -> None:
+    page = decode_response(ENDPOINT, content)
+    for incident in page.incidents:
+        incident.neris_id, incident.base, incident.dispatch
+
+
+def lazy(content: bytes) -> None:
+    page = decode_response(ENDPOINT, content, lazy=True)
+    for incident in page.incidents:
+        incident.neris_id, incident.base.to_model(), incident.dispatch.to_model()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares decoding a page of incidents and reading neris_id, base and dispatch of each")
+    parser.add_argument("-n", "--number", type=int, default=20, help="Decodings per measurement")
+    parser.add_argument("-p", "--page-size", type=int, default=50, help="Incidents per page")
+    parser.add_argument("-s", "--scale", type=int, default=20, help="Exposures, casualty rescues and comments per incident")
+    args = parser.parse_args()
+
+    content = json.dumps(
+        {"incidents": [incident_response(i, exposures=args.scale, casualty_rescues=args.scale, comments=args.scale) for i in range(args.page_size)]}
+    ).encode("utf-8")
+
+    print(f"page size: {len(content) / 1024:.1f} KiB")
+    for name, fn in [("json.loads + model_validate", via_dict), ("model_validate_json", model), ("lazy", lazy)]:
+        fn(content)
+        best = min(timeit.repeat(lambda: fn(content), number=args.number, repeat=5)) / args.number
+        print(f"{name:28s} {best * 1000:8.2f} ms")
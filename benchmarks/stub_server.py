@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta, timezone
+import json
+import math
+import multiprocessing
+import time
+import zlib
+from urllib.parse import parse_qs, unquote, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.payloads import incident_response
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    wbufsize = 65536
+    latency: float = 0.0
+    token_latency: float = 0.0
+    expires_in: int = 3600
+    pages: int = 3
+    etags: bool = False
+    stations: int = 2
+    dedupe: bool = False
+    error_status: int | None = None
+    incident_sizes: dict | None = None
+    created: set = set()
+
+    def setup(self):
+        super().setup()
+
+        with self.connections.get_lock():
+            self.connections.value += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict) -> None:
+        content = json.dumps(body).encode("utf-8")
+
+        # Answers conditional GETs for unchanged content with an empty 304
+        if self.etags and self.command == "GET":
+            etag = f'"{zlib.crc32(content):08x}"'
+
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.etags and self.command == "GET":
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _send_error(self) -> None:
+        self._send(self.error_status, {"detail": [{"loc": ["body", "base"], "msg": "Field required", "type": "missing"}]})
+
+    def do_GET(self):
+        time.sleep(self.latency)
+
+        if self.error_status:
+            self._send_error()
+            return
+
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        # Incidents created with `dedupe` can be fetched by their NERIS ID
+        if url.path.startswith("/incident/") and url.path.count("/") == 3:
+            neris_id = unquote(url.path.split("/")[3])
+            if neris_id in self.created:
+                self._send(200, {"neris_id": neris_id})
+            else:
+                self._send(404, {"detail": "Not found"})
+            return
+
+        # Incident listings are paged by an opaque cursor, here the page index. The listing holds
+        # `pages` full pages of incidents, each modified a minute after the one before.
+        if url.path.startswith("/incident/") and url.path.count("/") == 2:
+            page, size = int(query.get("cursor", 0)), int(query.get("page_size", 100))
+            start = datetime.fromisoformat(query["last_modified_start"]) if "last_modified_start" in query else EPOCH
+            first = max(math.ceil((start - EPOCH) / timedelta(minutes=1)), 0)
+            indexes = range(first + page * size, min(first + (page + 1) * size, self.pages * size))
+
+            self._send(
+                200,
+                {
+                    "incidents": [
+                        # Whole incidents with `incident_sizes`, otherwise just their IDs
+                        {
+                            **(incident_response(i, **self.incident_sizes) if self.incident_sizes is not None else {}),
+                            "neris_id": f"FD00000000|{i}|1700000000",
+                            "last_modified": (EPOCH + timedelta(minutes=i)).isoformat(),
+                        }
+                        for i in indexes
+                    ],
+                    "prev_cursor": str(page - 1) if page else None,
+                    "next_cursor": str(page + 1) if indexes and indexes[-1] + 1 < self.pages * size else None,
+                },
+            )
+            return
+
+        # Entity and user listings are paged by page number, starting from 1
+        if url.path.rstrip("/") in ("/entity", "/user"):
+            number, size = int(query.get("page_number", 1)), int(query.get("page_size", 100))
+            items = "entities" if url.path.startswith("/entity") else "users"
+            self._send(
+                200,
+                {
+                    "page_size": size,
+                    "page_count": self.pages,
+                    "page_number": number,
+                    "total_count": self.pages * size,
+                    items: [{"neris_id": f"FD{(number - 1) * size + i:08d}"} for i in range(size)],
+                },
+            )
+            return
+
+        # Entity details carry `stations` stations of three units each
+        if url.path.startswith("/entity/"):
+            neris_id = url.path.split("/")[2]
+            self._send(
+                200,
+                {
+                    "neris_id": neris_id,
+                    "name": f"Department {neris_id}",
+                    "state": "MD",
+                    "version": 1,
+                    "stations": [
+                        {
+                            "neris_id": f"{neris_id}S{s:03d}",
+                            "station_id": f"Station {s}",
+                            "state": "MD",
+                            "units": [
+                                {"neris_id": f"{neris_id}S{s:03d}U{u:03d}", "type": "ENGINE_STRUCT" if u else "LADDER_TALL", "staffing": 4}
+                                for u in range(3)
+                            ],
+                        }
+                        for s in range(self.stations)
+                    ],
+                },
+            )
+            return
+
+        self._send(200, {"path": self.path})
+
+    def do_POST(self):
+        body = self._read_body()
+
+        if self.path.endswith("/token"):
+            with self.token_requests.get_lock():
+                self.token_requests.value += 1
+
+            time.sleep(self.token_latency)
+            self._send(200, {"access_token": "access", "refresh_token": "refresh", "expires_in": self.expires_in})
+            return
+
+        with self.writes.get_lock():
+            self.writes.value += 1
+
+        time.sleep(self.latency)
+
+        if self.error_status:
+            self._send_error()
+            return
+
+        # Rejects a second submission of an incident, identified as the API does by its dispatch
+        if self.dedupe and self.command == "POST":
+            dispatch = json.loads(body).get("dispatch", {})
+            call_create = int(datetime.fromisoformat(dispatch.get("call_create")).timestamp())
+            neris_id = f"{self.path.split('/')[-1]}|{dispatch.get('incident_number')}|{call_create}"
+
+            if neris_id in self.created:
+                self._send(409, {"detail": "Incident already exists"})
+                return
+
+            self.created.add(neris_id)
+            self._send(201, {"neris_id": neris_id})
+            return
+
+        self._send(201, {"neris_id": "FD00000000|stub|1700000000"})
+
+    do_PUT = do_POST
+    do_PATCH = do_POST
+    do_DELETE = do_GET
+
+
+def _serve_forever(handler_attrs: dict, counters: dict, address: multiprocessing.Queue) -> None:
+    handler = type("Handler", (StubHandler,), {**handler_attrs, **counters})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+
+    address.put(server.server_address)
+    server.serve_forever()
+
+
+class StubServer:
+    """Runs the stub API in a separate process so it doesn't compete with the client for the GIL."""
+
+    def __init__(self, **handler_attrs):
+        address = multiprocessing.Queue()
+        self._counters = {
+            "connections": multiprocessing.Value("i", 0),
+            "token_requests": multiprocessing.Value("i", 0),
+            "writes": multiprocessing.Value("i", 0),
+        }
+
+        self._process = multiprocessing.Process(
+            target=_serve_forever, args=(handler_attrs, self._counters, address), daemon=True
+        )
+        self._process.start()
+
+        host, port = address.get()
+        self.base_url = f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        """Number of TCP connections accepted so far."""
+        return self._counters["connections"].value
+
+    @property
+    def token_requests(self) -> int:
+        """Number of requests made to the token endpoint so far."""
+        return self._counters["token_requests"].value
+
+    @property
+    def writes(self) -> int:
+        """Number of POST, PUT and PATCH requests made to the API so far."""
+        return self._counters["writes"].value
+
+    def shutdown(self) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+def serve(**handler_attrs) -> StubServer:
+    return StubServer(**handler_attrs)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+import logging
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.neris_api_client import NerisApiClient, Config
+from benchmarks.stub_server import StubServer, serve
+
+
+def make_client(url: str, pool_maxsize: int) -> NerisApiClient:
+    return NerisApiClient(
+        Config(
+            base_url=url,
+            grant_type="client_credentials",
+            client_id="bench",
+            client_secret="bench",
+            pool_maxsize=pool_maxsize,
+        )
+    )
+
+
+def run(server: StubServer, clients: list, requests_per_client: int) -> str:
+    def work(client: NerisApiClient) -> None:
+        for _ in range(requests_per_client):
+            client.get_entity("FD00000000")
+
+    connections = server.connections
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+        list(pool.map(work, clients))
+
+    rate = len(clients) * requests_per_client / (time.perf_counter() - start)
+    return f"{rate:8.0f} req/s, {server.connections - connections:6d} connections opened"
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares threaded throughput of a shared session against per-client pools")
+    parser.add_argument("-c", "--clients", type=int, default=32, help="Number of clients, one thread each")
+    parser.add_argument("-r", "--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("-l", "--latency", type=float, default=0.002, help="Stub server latency in seconds")
+    args = parser.parse_args()
+
+    # Keep urllib3 quiet about discarding connections from the full shared pool
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    server = serve(latency=args.latency)
+    url = server.base_url
+
+    # Previous behaviour: every client shares one session with the default urllib3 pool
+    shared_session = requests.Session()
+    shared = [make_client(url, 10) for _ in range(args.clients)]
+    for client in shared:
+        client._session = shared_session
+
+    per_instance = [make_client(url, 10) for _ in range(args.clients)]
+
+    print(f"shared session:   {run(server, shared, args.requests)}")
+    print(f"per-client pools: {run(server, per_instance, args.requests)}")
+
+    server.shutdown()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import statistics
+import threading
+import time
+from argparse import ArgumentParser
+
+from src.neris_api_client import NerisApiClient, Config
+from benchmarks.stub_server import StubServer, serve
+
+
+def run(server: StubServer, threads: int, duration: float, **config) -> str:
+    client = NerisApiClient(
+        Config(
+            base_url=server.base_url,
+            grant_type="client_credentials",
+            client_id="bench",
+            client_secret="bench",
+            pool_maxsize=threads,
+            **config,
+        )
+    )
+    client.health()  # fetch the first token outside of the measurement
+
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    def work() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            client.health()
+            latencies.append(time.perf_counter() - start)
+
+    token_requests = server.token_requests
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    client.close()
+
+    quantiles = statistics.quantiles(latencies, n=1000)
+    return (
+        f"p50 {quantiles[499] * 1000:7.1f} ms, p99 {quantiles[989] * 1000:7.1f} ms, "
+        f"p99.9 {quantiles[998] * 1000:7.1f} ms, max {max(latencies) * 1000:7.1f} ms, "
+        f"{server.token_requests - token_requests:3d} token requests"
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures request tail latency across token expiry against a mocked token endpoint")
+    parser.add_argument("-t", "--threads", type=int, default=16, help="Number of threads making requests")
+    parser.add_argument("-d", "--duration", type=float, default=10, help="Seconds to run each scenario")
+    parser.add_argument("-e", "--expires-in", type=int, default=3, help="Lifetime of issued tokens in seconds")
+    parser.add_argument("-l", "--token-latency", type=float, default=0.25, help="Token endpoint latency in seconds")
+    args = parser.parse_args()
+
+    server = serve(latency=0.002, token_latency=args.token_latency, expires_in=args.expires_in)
+
+    print(f"refresh on expiry:      {run(server, args.threads, args.duration, token_refresh_skew=0)}")
+    print(f"refresh 1s before:      {run(server, args.threads, args.duration, token_refresh_skew=1)}")
+    print(f"refresh in background:  {run(server, args.threads, args.duration, token_refresh_skew=1, token_refresh_background=True)}")
+
+    server.shutdown()
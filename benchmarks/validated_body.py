@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+import json
+import timeit
+from argparse import ArgumentParser
+
+from src.neris_api_client.models import IncidentPayload
+from benchmarks.payloads import incident
+
+
+def previous(data: dict) -> bytes:
+    # validate, dump to a dict, then have requests re-encode the dict with the standard library
+    dumped = IncidentPayload.model_validate(data).model_dump(mode="json", by_alias=True)
+    return json.dumps(dumped, allow_nan=False).encode("utf-8")
+
+
+def previous_json(data: str) -> bytes:
+    dumped = IncidentPayload.model_validate_json(data).model_dump(mode="json", by_alias=True)
+    return json.dumps(dumped, allow_nan=False).encode("utf-8")
+
+
+def current(data: dict) -> bytes:
+    return IncidentPayload.model_validate(data).model_dump_json(by_alias=True).encode("utf-8")
+
+
+def current_json(data: str) -> bytes:
+    return IncidentPayload.model_validate_json(data).model_dump_json(by_alias=True).encode("utf-8")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compares encoding validated incident bodies via a dict against dumping JSON directly")
+    parser.add_argument("-n", "--number", type=int, default=200, help="Encodings per measurement")
+    parser.add_argument("-s", "--scale", type=int, default=50, help="Exposures, casualty rescues and comments per incident")
+    args = parser.parse_args()
+
+    data = incident(exposures=args.scale, casualty_rescues=args.scale, comments=args.scale)
+    text = json.dumps(data)
+    assert json.loads(previous(data)) == json.loads(current(data))
+
+    print(f"payload size: {len(text) / 1024:.1f} KiB")
+    for name, fn, arg in [
+        ("dict body, validate + dump + json.dumps", previous, data),
+        ("dict body, validate + model_dump_json", current, data),
+        ("str body, validate + dump + json.dumps", previous_json, text),
+        ("str body, validate + model_dump_json", current_json, text),
+    ]:
+        seconds = min(timeit.repeat(lambda: fn(arg), number=args.number, repeat=5)) / args.number
+        print(f"{name:42s} {seconds * 1e6:9.0f} us")
@@ -1,2 +1,27 @@
+import importlib
+
+from .cache import *
 from .client import *
+from .async_client import *
 from .config import *
+from .endpoints import *
+from .exceptions import *
+from .ledger import *
+from .patch import *
+from .coalesce import *
+from .ratelimit import *
+from .mirror import *
+from .outbox import *
+from .responses import *
+from .retry import *
+from .sync import *
+from .token_store import *
+from .validation import *
+
+
+def __getattr__(name: str):
+    # The generated models are only imported once they are accessed
+    if name == "models":
+        return importlib.import_module(f"{__name__}.models")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,7 @@
+from pydantic import BaseModel as _BaseModel, ConfigDict
+
+
+class BaseModel(_BaseModel):
+    """Base of the generated models. Validators are built when a model is first used rather than at import."""
+
+    model_config = ConfigDict(defer_build=True)
@@ -0,0 +1,450 @@
+import asyncio
+from collections import deque
+from datetime import datetime
+import itertools
+from http import HTTPStatus
+from typing import Optional, Dict, Any, Iterable, AsyncIterable, AsyncIterator, Deque, TYPE_CHECKING
+
+from .client import _NerisApiClient, _NerisApiEndpoints, BulkResult, Timeout, _neris_id_of, _page_field, _query
+from .cache import CachedResponse
+from .exceptions import NerisAuthError, NerisTimeoutError, _error_for, _raise_for_status
+from .ledger import incident_key, _is_neris_id
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from .models import IncidentPayload, IncidentSortBy, DeptSortBy, SortDirection
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+__all__ = ("AsyncNerisApiClient",)
+
+
+class _AsyncNerisApiClient(_NerisApiClient):
+    _session: "httpx.AsyncClient"
+
+    def _open_session(self) -> None:
+        if httpx is None:
+            raise ImportError("AsyncNerisApiClient requires httpx. Install it with `pip install neris_api_client[async]`")
+
+        self._session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.config.pool_maxsize,
+                max_keepalive_connections=self.config.pool_maxsize,
+                keepalive_expiry=self.config.pool_keepalive or None,
+            ),
+        )
+        self._auth_lock = asyncio.Lock()
+
+    def close(self) -> None:
+        raise TypeError("AsyncNerisApiClient is closed with `await client.aclose()`")
+
+    async def aclose(self) -> None:
+        self._closed.set()
+
+        if self._refresher is not None:
+            self._refresher.cancel()
+
+        await self._session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _update_auth(self) -> None:
+        expired = self._tokens_expired()
+
+        # A running background refresher takes care of refreshing ahead of expiry
+        if not expired and (self._refresher is not None or not self._refresh_due()):
+            return
+
+        # While the current token is still valid, one task refreshes it and the rest carry on.
+        # Once it has expired, every task waits on the single in-flight refresh.
+        if not expired and self._auth_lock.locked():
+            return
+
+        async with self._auth_lock:
+            try:
+                if self._refresh_due():
+                    await self._refresh_tokens()
+            except Exception as e:
+                # Ahead of expiry a failed refresh is retried on a later call, while the current token still works
+                if self._tokens_expired():
+                    raise
+
+                self._debug.refresh_failed(e)
+
+        if self.config.token_refresh_background and self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self) -> None:
+        delay = 0.0
+
+        while not self._closed.is_set():
+            await asyncio.sleep(delay)
+
+            try:
+                async with self._auth_lock:
+                    if self._refresh_due():
+                        await self._refresh_tokens()
+            except Exception:
+                pass  # callers refresh in the foreground once the token expires
+
+            until_expiry = (self.tokens.expires_at - datetime.now()).total_seconds()
+            delay = max(until_expiry - self.config.token_refresh_skew, 1.0)
+
+    async def _refresh_tokens(self) -> None:
+        lock = self._token_store.lock(self._token_key)
+
+        # Reuse tokens another client saved to the store, and only request new ones when those are due too
+        await asyncio.to_thread(lock.__enter__)
+        try:
+            stored = self._token_store.load(self._token_key)
+
+            if stored is not None:
+                self.tokens = stored
+
+            if self._refresh_due():
+                await self._request_tokens()
+                self._token_store.save(self._token_key, self.tokens)
+        finally:
+            lock.__exit__(None, None, None)
+
+    async def _request_tokens(self) -> None:
+        token_url: str = f"{self.config.base_url}/token"
+
+        res = await self._post_token(token_url, self._token_request())
+
+        while True:
+            if self._debug.sampled():
+                self._debug.exchange("token", "post", token_url, res)
+
+            # A 400, 401 or 403 means the credentials or the MFA code were rejected; other errors keep their own class
+            if res.status_code not in (HTTPStatus.OK, HTTPStatus.ACCEPTED):
+                raise _error_for(res, NerisAuthError if res.status_code in (400, 401, 403) else None)
+
+            got: dict = res.json()
+
+            # Successfully generated tokens
+            if res.status_code == HTTPStatus.OK:
+                self._set_tokens(got)
+                break
+
+            # Respond to MFA challenge
+            elif res.status_code == HTTPStatus.ACCEPTED:
+                code: str = await asyncio.to_thread(input, f"Provide MFA code for {got['challenge_name']}: ")
+
+                res = await self._post_token(token_url, self._mfa_request(got, code))
+
+    async def _post_token(self, token_url: str, request: Dict[str, Any]) -> "httpx.Response":
+        try:
+            return await self._session.post(token_url, **request, timeout=self.config.token_timeout)
+        except httpx.TimeoutException as e:
+            raise NerisTimeoutError(f"Token request timed out: {e!r}", token_url, self.config.token_timeout) from e
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[str | Dict[str, Any] | "BaseModel"] = None,
+        params: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        timeout: Timeout | None = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> "httpx.Response":
+        body = self._encode_body(data, endpoint)
+
+        timeout = timeout if timeout is not None else (self.config.connect_timeout, self.config.read_timeout)
+
+        match timeout:
+            case (connect, read):
+                request_timeout = httpx.Timeout(read, connect=connect)
+            case _:
+                request_timeout = httpx.Timeout(timeout)
+
+        url = f"{self.config.base_url}{path}"
+        policy = self.config.retry
+        self.retry_stats.record_request()
+
+        for attempt in itertools.count():
+            await self._update_auth()
+            headers = {**self._headers(body), **(extra_headers or {})}
+
+            if self.config.rate_limiter:
+                await self.config.rate_limiter.acquire_async(path)
+
+            self.retry_stats.record_attempt()
+
+            try:
+                res = await self._session.request(method, url, content=body, params=params, headers=headers, timeout=request_timeout)
+            except httpx.TimeoutException as e:
+                if not self._can_retry(method, attempt, idempotent):
+                    raise NerisTimeoutError(f"Request timed out: {e!r}", url, timeout) from e
+
+                reason, retry_after = "timeout", None
+            except (httpx.NetworkError, httpx.RemoteProtocolError):
+                if not self._can_retry(method, attempt, idempotent):
+                    raise
+
+                reason, retry_after = "connection_error", None
+            else:
+                if self._debug.sampled():
+                    request = {"body": body, "headers": {**self._session.headers, **headers}, "params": params}
+                    self._debug.exchange("request", method, url, res, request)
+
+                if res.status_code not in policy.status_forcelist or not self._can_retry(method, attempt, idempotent):
+                    return res
+
+                reason, retry_after = res.status_code, policy.parse_retry_after(res.headers)
+
+            self.retry_stats.record_retry(reason)
+            await asyncio.sleep(policy.backoff(attempt, retry_after))
+
+    async def _fetch(self, path: str, params: Dict[str, Any], endpoint: str, timeout: Timeout | None = None) -> Any:
+        res = await self._request("get", path, params=params, endpoint=endpoint, timeout=timeout)
+        _raise_for_status(res)
+
+        return self._decode_response(res, endpoint)
+
+    async def _create_incident(self, path: str, data: Any, timeout: Timeout | None = None) -> "CachedResponse | httpx.Response":
+        body = self._encode_body(data, "create_incident")
+        key = incident_key(path.rsplit("/", 1)[1], body)
+
+        replayed = self._replayed(key, path)
+        if replayed is not None:
+            return replayed
+
+        res = await self._request(
+            "post", path, body, endpoint="create_incident", timeout=timeout, extra_headers={"Idempotency-Key": key}, idempotent=_is_neris_id(key)
+        )
+
+        return self._settle(key, path, res, await self._conflict_confirmed(key, path, res, timeout))
+
+    async def _conflict_confirmed(self, key: str, path: str, res: Any, timeout: Timeout | None) -> bool:
+        if res.status_code != HTTPStatus.CONFLICT or not _is_neris_id(key) or _neris_id_of(res) is not None:
+            return False
+
+        return (await self._request("get", f"{path}/{key}", timeout=timeout)).status_code == HTTPStatus.OK
+
+    async def _cached_get(
+        self, path: str, params: Optional[Dict[str, Any]], endpoint: Optional[str], timeout: Timeout | None
+    ) -> "CachedResponse | httpx.Response":
+        cache = self.config.cache
+        key = cache.key(self._token_key, path, params)
+        entry, fresh = cache.lookup(key)
+
+        if fresh:
+            cache.stats.record("hits")
+            return entry
+
+        res = await self._request("get", path, params=params, endpoint=endpoint, timeout=timeout, extra_headers=entry and entry.validators)
+
+        if res.status_code == HTTPStatus.NOT_MODIFIED and entry is not None:
+            cache.touch(key, entry)
+            cache.stats.record("hits")
+            cache.stats.record("revalidated")
+            return entry
+
+        cache.stats.record("misses")
+
+        if res.status_code == HTTPStatus.OK:
+            return cache.store(key, res, path)
+
+        return res
+
+    async def _write(
+        self,
+        method: str,
+        path: str,
+        data: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        timeout: Timeout | None = None,
+    ):
+        # Every write, whether or not it succeeded, may have changed what cached reads of its path return
+        try:
+            if endpoint == "create_incident":
+                return await self._create_incident(path, data, timeout)
+
+            return await self._request(method, path, data, params, endpoint, timeout)
+        finally:
+            if self.config.cache is not None:
+                self.config.cache.invalidate(path)
+
+    async def _call(
+        self,
+        method: str,
+        path: str,
+        data: Optional[str | Dict[str, Any] | "BaseModel"] = None,
+        params: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        timeout: Timeout | None = None,
+    ):
+        if self.config.cache is not None and method == "get":
+            res = await self._cached_get(path, params, endpoint, timeout)
+        elif method == "get":
+            res = await self._request(method, path, data, params, endpoint, timeout)
+        else:
+            res = await self._write(method, path, data, params, endpoint, timeout)
+
+        if isinstance(res, CachedResponse):
+            return self._decode_response(res, endpoint)
+
+        _raise_for_status(res)
+
+        return self._decode_response(res, endpoint)
+
+
+class AsyncNerisApiClient(_AsyncNerisApiClient, _NerisApiEndpoints):
+    async def create_incidents(
+        self,
+        neris_id: str,
+        bodies: "Iterable[str | Dict[str, Any] | IncidentPayload] | AsyncIterable[str | Dict[str, Any] | IncidentPayload]",
+        concurrency: int = 8,
+        ordered: bool = True,
+        timeout: Timeout | None = None,
+    ) -> AsyncIterator[BulkResult]:
+        """Async counterpart of `NerisApiClient.create_incidents`, also accepting an async iterable of bodies."""
+        async def submit(index: int, body: "str | Dict[str, Any] | IncidentPayload") -> BulkResult:
+            try:
+                res = await self._write("post", f"/incident/{neris_id}", body, endpoint="create_incident", timeout=timeout)
+            except Exception as e:
+                return BulkResult(index, error=e)
+
+            return self._bulk_result(index, res)
+
+        async def enumerated():
+            index = 0
+
+            if isinstance(bodies, AsyncIterable):
+                async for body in bodies:
+                    yield index, body
+                    index += 1
+            else:
+                for body in bodies:
+                    yield index, body
+                    index += 1
+
+        window = 2 * concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+        pending: Deque[asyncio.Task] = deque()
+
+        async def limited(index: int, body: "str | Dict[str, Any] | IncidentPayload") -> BulkResult:
+            async with semaphore:
+                return await submit(index, body)
+
+        async def complete() -> list:
+            if ordered:
+                return [await pending.popleft()]
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.remove(task)
+
+            return [task.result() for task in done]
+
+        try:
+            async for index, body in enumerated():
+                pending.append(asyncio.create_task(limited(index, body)))
+
+                if len(pending) >= window:
+                    for result in await complete():
+                        yield result
+
+            while pending:
+                for result in await complete():
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _iter_pages(
+        self, path: str, endpoint: str, items: str, params: Dict[str, Any], concurrency: int, timeout: Timeout | None
+    ) -> AsyncIterator[Any]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(page_number: int) -> Any:
+            async with semaphore:
+                return await self._fetch(path, _query(page_number=page_number, **params), endpoint, timeout)
+
+        first = await fetch(1)
+        for item in _page_field(first, items) or []:
+            yield item
+
+        numbers = iter(range(2, _page_field(first, "page_count") + 1))
+        pending: Deque[asyncio.Task] = deque(asyncio.create_task(fetch(n)) for n in itertools.islice(numbers, 2 * concurrency))
+
+        try:
+            while pending:
+                page = await pending.popleft()
+
+                for n in itertools.islice(numbers, 1):
+                    pending.append(asyncio.create_task(fetch(n)))
+
+                for item in _page_field(page, items) or []:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_entities(
+        self,
+        sort_by: "DeptSortBy | str | None" = None,
+        sort_direction: "SortDirection | str | None" = None,
+        page_size: int | None = None,
+        concurrency: int = 4,
+        timeout: Timeout | None = None,
+    ) -> AsyncIterator[Any]:
+        params = {"page_size": page_size, "sort_by": sort_by, "sort_direction": sort_direction}
+        async for entity in self._iter_pages("/entity", "list_entities", "entities", params, concurrency, timeout):
+            yield entity
+
+    async def iter_users(self, page_size: int | None = None, concurrency: int = 4, timeout: Timeout | None = None) -> AsyncIterator[Any]:
+        async for user in self._iter_pages("/user", "list_users", "users", {"page_size": page_size}, concurrency, timeout):
+            yield user
+
+    async def iter_incidents(
+        self,
+        neris_id_entity: str,
+        sort_by: "IncidentSortBy | str | None" = None,
+        sort_direction: "SortDirection | str | None" = None,
+        page_size: int | None = None,
+        last_modified_start: datetime | None = None,
+        timeout: Timeout | None = None,
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of `NerisApiClient.iter_incidents`, prefetching the next page in a task."""
+        async def fetch(cursor: str | None) -> Any:
+            params = _query(
+                cursor=cursor,
+                page_size=page_size,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+                last_modified_start=last_modified_start,
+            )
+            return await self._fetch(f"/incident/{neris_id_entity}", params, "list_incidents", timeout)
+
+        upcoming: asyncio.Task | None = None
+
+        try:
+            page = await fetch(None)
+
+            while True:
+                incidents = _page_field(page, "incidents")
+                cursor = _page_field(page, "next_cursor")
+                upcoming = asyncio.create_task(fetch(cursor)) if cursor and incidents else None
+
+                for incident in incidents:
+                    yield incident
+
+                if upcoming is None:
+                    return
+
+                page = await upcoming
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
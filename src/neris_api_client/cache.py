@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+__all__ = ("ResponseCache", "CacheStats", "CachedResponse")
+
+
+@dataclass
+class CachedResponse:
+    """A stored GET response, with the parts of `requests.Response` the client reads."""
+
+    path: str
+    status_code: int
+    content: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: float = field(default_factory=time.time)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    invalidated: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def record(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+
+def _related(a: str, b: str) -> bool:
+    # A write to a resource affects its parents and children, e.g. patching a station changes its entity
+    a, b = a.rstrip("/"), b.rstrip("/")
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+class ResponseCache:
+    """Cache of GET responses, safe to share between threads and clients.
+
+    Responses that carry an `ETag` or `Last-Modified` header are revalidated with a conditional
+    request on every use, which costs a round trip but not the payload. Responses without either
+    are served from the cache for `ttl` seconds. Writes made through a client drop the cached
+    responses of the resource written, its parents and its children.
+
+    The in-memory tier holds at most `max_entries` responses and `max_bytes` of content, evicting
+    the least recently used. With `path`, responses are also kept in a SQLite file, which outlives
+    the process and is consulted when a response is not in memory.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, path: str | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, path TEXT, status_code INTEGER, content BLOB, etag TEXT, last_modified TEXT, stored_at REAL)"
+            )
+
+    @staticmethod
+    def key(scope: str, path: str, params: Dict[str, Any] | None) -> str:
+        return json.dumps([scope, path, sorted((params or {}).items())], default=str)
+
+    def lookup(self, key: str) -> Tuple[CachedResponse | None, bool]:
+        """The stored response for `key`, if any, and whether it can be used without asking the server."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT path, status_code, content, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is not None:
+                    entry = CachedResponse(*row)
+                    self._remember(key, entry)
+
+        if entry is None:
+            return None, False
+
+        return entry, not entry.validators and time.time() - entry.stored_at < self.ttl
+
+    def store(self, key: str, res: Any, path: str) -> CachedResponse:
+        entry = CachedResponse(
+            path=path,
+            status_code=res.status_code,
+            content=res.content,
+            etag=res.headers.get("ETag"),
+            last_modified=res.headers.get("Last-Modified"),
+        )
+
+        with self._lock:
+            self._remember(key, entry)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, entry.path, entry.status_code, entry.content, entry.etag, entry.last_modified, entry.stored_at),
+                )
+
+        return entry
+
+    def touch(self, key: str, entry: CachedResponse) -> None:
+        """Marks a response the server confirmed unchanged as fresh again."""
+        with self._lock:
+            entry.stored_at = time.time()
+
+            if self._db is not None:
+                self._db.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (entry.stored_at, key))
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if _related(entry.path, path)]
+
+            for key in stale:
+                self._size -= len(self._entries.pop(key).content)
+
+            if self._db is not None:
+                paths = [p for p, in self._db.execute("SELECT DISTINCT path FROM responses")]
+                for p in filter(lambda p: _related(p, path), paths):
+                    self._db.execute("DELETE FROM responses WHERE path = ?", (p,))
+
+        self.stats.record("invalidated", len(stale))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous.content)
+
+        self._entries[key] = entry
+        self._size += len(entry.content)
+
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.content)
@@ -1,43 +1,123 @@
 import base64
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
 from http import HTTPStatus
+import itertools
 import json
+import threading
+import time
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Callable, Deque, Tuple, TYPE_CHECKING
 from datetime import datetime, timedelta
 
 import requests
-from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 
-from .config import Config, GrantType, TokenSet
+from .config import Config, GrantType, ResponseMode, TokenSet
+from .token_store import TokenStore, MemoryTokenStore, FileTokenStore
+from .retry import RetryStats
+from .cache import CachedResponse
+from .debug import _Debug
+from .exceptions import NerisAuthError, NerisTimeoutError, _error_for, _raise_for_status
+from .ledger import incident_key, _is_neris_id
+from .endpoints import ENDPOINTS
+from .responses import decode_response
 
-from .models import (
-    IncidentPayload,
-    PatchUnitPayload,
-    CreateUserPayload,
-    DepartmentPayload,
-    UpdateUserPayload,
-    PatchStationPayload,
-    PatchDepartmentPayload,
-    CreateDepartmentPayload,
-    PatchIncidentAction,
-    TypeIncidentStatusValue,
-)
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from .models import (
+        IncidentPayload,
+        PatchUnitPayload,
+        CreateUserPayload,
+        DepartmentPayload,
+        UpdateUserPayload,
+        PatchStationPayload,
+        PatchDepartmentPayload,
+        CreateDepartmentPayload,
+        PatchIncidentAction,
+        TypeIncidentStatusValue,
+        IncidentSortBy,
+        DeptSortBy,
+        SortDirection,
+    )
 
-__all__ = ("NerisApiClient",)
+__all__ = ("NerisApiClient", "BulkResult")
 
+# Seconds, either for connecting and reading alike or as a (connect, read) pair
+Timeout = float | Tuple[float, float]
 
-class Encoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, requests.structures.CaseInsensitiveDict):
-            return {k: v for k, v in obj.items()}
 
-        return super().default(obj)
+@dataclass
+class BulkResult:
+    index: int
+    status_code: int | None = None
+    neris_id: str | None = None
+    error: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _query(**params: Any) -> Dict[str, Any]:
+    """Query parameters without the unset ones, with enums sent as their values and datetimes in ISO format."""
+    return {k: v.isoformat() if isinstance(v, datetime) else getattr(v, "value", v) for k, v in params.items() if v is not None}
+
+
+def _page_field(page: Any, name: str) -> Any:
+    # Pages are dicts or models depending on `Config.response_mode`
+    return page.get(name) if isinstance(page, dict) else getattr(page, name)
+
+
+def _created(path: str, neris_id: str) -> CachedResponse:
+    # Stands in for the response to a submission that was accepted earlier
+    return CachedResponse(path, HTTPStatus.OK, json.dumps({"neris_id": neris_id}).encode("utf-8"))
+
+
+def _neris_id_of(res: Any) -> str | None:
+    # The NERIS ID a write response names, if its body is a JSON object with one
+    try:
+        got = res.json()
+    except ValueError:
+        return None
+
+    return got.get("neris_id") if isinstance(got, dict) else None
+
+
+def _bounded_map(
+    fn: Callable, items: Iterable, concurrency: int, ordered: bool = True, executor: Callable[..., Executor] = ThreadPoolExecutor
+) -> Iterator:
+    """Maps `fn` over `items` on a pool of workers, holding at most twice `concurrency` items in memory at a time."""
+    window = 2 * concurrency
+
+    with executor(max_workers=concurrency) as pool:
+        pending: Deque[Future] = deque()
+
+        def complete() -> Iterator:
+            if ordered:
+                yield pending.popleft().result()
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+
+        for item in items:
+            pending.append(pool.submit(fn, item))
+
+            if len(pending) >= window:
+                yield from complete()
+
+        while pending:
+            yield from complete()
 
 
 class _NerisApiClient:
     config: Config
-    tokens: TokenSet | None = TokenSet(access_token="", refresh_token="", expires_at=datetime.min)
-    _session: requests.Session = requests.Session()
+    tokens: TokenSet | None
+    _session: requests.Session
 
     def __init__(self, config: Config | None = None):
         if config is None:
@@ -55,229 +135,565 @@ class _NerisApiClient:
                 raise Exception("Bad grant type. Must be \"password\" or \"client_credentials\"")
 
         self.config = config
-
-    def _update_auth(self) -> None:
-        res: requests.Response | None = None
-        token_url: str = f"{self.config.base_url}/token"
-
-        if self.tokens.expires_at <= datetime.now() and not self.tokens.refresh_token:
+        self.tokens = TokenSet(access_token="", refresh_token="", expires_at=datetime.min)
+        self._token_key = f"{config.base_url}|{GrantType(config.grant_type).value}|{config.client_id or config.username}"
+        self._token_store: TokenStore = config.token_store or (
+            FileTokenStore(config.token_store_path) if config.token_store_path else MemoryTokenStore()
+        )
+        self.retry_stats = RetryStats()
+        self._debug = _Debug(config.debug, config.debug_sample_rate, config.debug_max_body)
+        self._auth_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._refresher: threading.Thread | None = None
+        self._open_session()
+
+    def _open_session(self) -> None:
+        # Each client owns its own connection pool
+        self._session = requests.Session()
+        self._pool_lock = threading.Lock()
+        self._replace_adapter()
+        self._last_used = time.monotonic()
+
+    def _replace_adapter(self) -> None:
+        adapter = HTTPAdapter(pool_connections=self.config.pool_connections, pool_maxsize=self.config.pool_maxsize)
+
+        # Existing prefixes are reassigned in place, which `mount` would reorder under concurrent lookups
+        self._session.adapters.update({"https://": adapter, "http://": adapter})
+
+    def _recycle_idle_connections(self) -> None:
+        now = time.monotonic()
+
+        with self._pool_lock:
+            idle = self.config.pool_keepalive and now - self._last_used > self.config.pool_keepalive
+            self._last_used = now
+
+            # Connections idle longer than the keep-alive duration are dropped along with their pool, once
+            # no request still holds it, rather than closed under a request that may be using one
+            if idle:
+                self._replace_adapter()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._session.close()
+
+    def warmup(self) -> None:
+        """Imports the models and builds the request and response validators of every endpoint.
+
+        Validators are otherwise built on first use, which adds to the latency of the first request
+        to each endpoint, most of all for the larger incident models.
+        """
+        for endpoint in ENDPOINTS.values():
+            endpoint.warmup()
+
+    def _refresh_due(self) -> bool:
+        return self.tokens.expires_at <= datetime.now() + timedelta(seconds=self.config.token_refresh_skew)
+
+    def _tokens_expired(self) -> bool:
+        return self.tokens.expires_at <= datetime.now()
+
+    def _token_request(self) -> Dict[str, Any]:
+        if not self.tokens.refresh_token:
             match self.config.grant_type:
                 case GrantType.PASSWORD:
-                    res = self._session.post(
-                        token_url,
-                        headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                        data={
+                    return {
+                        "headers": {'Content-Type': 'application/x-www-form-urlencoded'},
+                        "data": {
                             "grant_type": GrantType.PASSWORD,
                             "username": self.config.username,
                             "password": self.config.password,
                         },
-                    )
+                    }
 
                 case GrantType.CLIENT_CREDENTIALS:
-                    res = self._session.post(
-                        token_url,
-                        headers={"Authorization": f"Basic {self.client_creds}", "Content-Type": "application/x-www-form-urlencoded"},
-                        data={"grant_type": GrantType.CLIENT_CREDENTIALS},
-                    )
+                    return {
+                        "headers": {"Authorization": f"Basic {self.client_creds}", "Content-Type": "application/x-www-form-urlencoded"},
+                        "data": {"grant_type": GrantType.CLIENT_CREDENTIALS},
+                    }
 
-        elif self.tokens.expires_at <= datetime.now():
-            match self.config.grant_type:
-                case GrantType.PASSWORD:
-                    res = self._session.post(
-                        token_url,
-                        # No basic auth needed for Cognito refresh tokens
-                        headers={"Content-Type": "application/x-www-form-urlencoded"},
-                        data={
-                            "grant_type": "refresh_token",
-                            "refresh_token": self.tokens.refresh_token,
-                        },
-                    )
+        match self.config.grant_type:
+            case GrantType.PASSWORD:
+                return {
+                    # No basic auth needed for Cognito refresh tokens
+                    "headers": {"Content-Type": "application/x-www-form-urlencoded"},
+                    "data": {
+                        "grant_type": "refresh_token",
+                        "refresh_token": self.tokens.refresh_token,
+                    },
+                }
 
-                case GrantType.CLIENT_CREDENTIALS:
-                    res = self._session.post(
-                        token_url,
-                        # Basic auth required for NERIS refresh tokens
-                        headers={"Authorization": f"Basic {self.client_creds}", "Content-Type": "application/x-www-form-urlencoded"},
-                        data={
-                            "grant_type": "refresh_token",
-                            "refresh_token": self.tokens.refresh_token,
-                        },
-                    )
+            case GrantType.CLIENT_CREDENTIALS:
+                return {
+                    # Basic auth required for NERIS refresh tokens
+                    "headers": {"Authorization": f"Basic {self.client_creds}", "Content-Type": "application/x-www-form-urlencoded"},
+                    "data": {
+                        "grant_type": "refresh_token",
+                        "refresh_token": self.tokens.refresh_token,
+                    },
+                }
+
+    def _mfa_request(self, got: Dict[str, Any], code: str) -> Dict[str, Any]:
+        return {
+            "headers": {'Content-Type': 'application/x-www-form-urlencoded'},
+            "data": {
+                "grant_type": got["challenge_name"],
+                "username": self.config.username,
+                "session": got["session"],
+                got["challenge_name"]: code,
+            },
+        }
+
+    def _set_tokens(self, got: Dict[str, Any]) -> None:
+        self.tokens = TokenSet(
+            access_token=got["access_token"],
+            refresh_token=got["refresh_token"],
+            expires_at=datetime.now() + timedelta(seconds=got["expires_in"]),
+        )
+
+    def _encode_body(self, data: Optional[bytes | str | Dict[str, Any] | "BaseModel"], endpoint: Optional[str]) -> bytes | None:
+        # Bytes were encoded, and validated, ahead of time
+        if data is None or isinstance(data, bytes):
+            return data
+
+        # The request model is resolved only where it is used, since that imports the models module
+        if hasattr(data, "model_dump_json"):
+            # Model instances were validated when they were built, so they are only serialized
+            model = ENDPOINTS[endpoint].request_validator() if endpoint else None
+            if model and not isinstance(data, model):
+                raise TypeError(f"Expected a {model.__name__} instance, got {type(data).__name__}")
+
+            return data.model_dump_json(by_alias=True).encode("utf-8")
+
+        # Validate once and serialize the validated model straight to JSON bytes
+        model = ENDPOINTS[endpoint].request_validator() if self.config.validate and endpoint else None
+        if model:
+
+            if isinstance(data, str):
+                return model.model_validate_json(data).model_dump_json(by_alias=True).encode("utf-8")
+
+            return model.model_validate(data).model_dump_json(by_alias=True).encode("utf-8")
+
+        if isinstance(data, str):
+            return data.encode("utf-8")
+
+        return json.dumps(data).encode("utf-8")
 
-        if not res:
+    def _decode_response(self, res: Any, endpoint: Optional[str]) -> Any:
+        if endpoint and ENDPOINTS[endpoint].response_model:
+            match self.config.response_mode:
+                case ResponseMode.MODEL:
+                    return decode_response(ENDPOINTS[endpoint], res.content)
+                case ResponseMode.LAZY:
+                    return decode_response(ENDPOINTS[endpoint], res.content, lazy=True)
+
+        try:
+            return res.json()
+        except ValueError:
+            return res.text
+
+    def _fetch(self, path: str, params: Dict[str, Any], endpoint: str, timeout: Timeout | None = None) -> Any:
+        res = self._request("get", path, params=params, endpoint=endpoint, timeout=timeout)
+        _raise_for_status(res)
+
+        return self._decode_response(res, endpoint)
+
+    def _headers(self, body: bytes | None) -> Dict[str, str]:
+        headers = {"Authorization": f"Bearer {self.tokens.access_token}"}
+
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        return headers
+
+    def _can_retry(self, method: str, attempt: int, idempotent: bool = False) -> bool:
+        if not idempotent and method.lower() not in self.config.retry.allowed_methods:
+            return False
+
+        if attempt >= self.config.retry.total:
+            self.retry_stats.record_exhausted()
+            return False
+
+        return True
+
+    def _bulk_result(self, index: int, res: Any) -> BulkResult:
+        if res.status_code >= 400:
+            return BulkResult(index, res.status_code, error=_error_for(res))
+
+        return BulkResult(index, res.status_code, neris_id=_neris_id_of(res))
+
+    def _update_auth(self) -> None:
+        expired = self._tokens_expired()
+
+        # A running background refresher takes care of refreshing ahead of expiry
+        if not expired and (self._refresher is not None or not self._refresh_due()):
+            return
+
+        # While the current token is still valid, one caller refreshes it and the rest carry on.
+        # Once it has expired, every caller waits on the single in-flight refresh.
+        if not self._auth_lock.acquire(blocking=expired):
             return
 
+        try:
+            if self._refresh_due():
+                self._refresh_tokens()
+        except Exception as e:
+            # Ahead of expiry a failed refresh is retried on a later call, while the current token still works
+            if self._tokens_expired():
+                raise
+
+            self._debug.refresh_failed(e)
+        finally:
+            self._auth_lock.release()
+
+        if self.config.token_refresh_background and self._refresher is None:
+            self._refresher = threading.Thread(target=self._refresh_in_background, daemon=True)
+            self._refresher.start()
+
+    def _refresh_in_background(self) -> None:
+        delay = 0.0
+
+        while not self._closed.wait(delay):
+            try:
+                with self._auth_lock:
+                    if self._refresh_due():
+                        self._refresh_tokens()
+            except Exception:
+                pass  # callers refresh in the foreground once the token expires
+
+            until_expiry = (self.tokens.expires_at - datetime.now()).total_seconds()
+            delay = max(until_expiry - self.config.token_refresh_skew, 1.0)
+
+    def _refresh_tokens(self) -> None:
+        # Reuse tokens another client saved to the store, and only request new ones when those are due too
+        with self._token_store.lock(self._token_key):
+            stored = self._token_store.load(self._token_key)
+
+            if stored is not None:
+                self.tokens = stored
+
+            if self._refresh_due():
+                self._request_tokens()
+                self._token_store.save(self._token_key, self.tokens)
+
+    def _request_tokens(self) -> None:
+        token_url: str = f"{self.config.base_url}/token"
+
+        res = self._post_token(token_url, self._token_request())
+
         while True:
-            if self.config.debug:
-                print(
-                    json.dumps(
-                        {
-                            "token_response": {
-                                "status_code": res.status_code,
-                                "headers": res.headers,
-                                "content": res.text,
-                            }
-                        },
-                        indent=4,
-                        cls=Encoder,
-                    ),
-                )
+            if self._debug.sampled():
+                self._debug.exchange("token", "post", token_url, res)
+
+            # A 400, 401 or 403 means the credentials or the MFA code were rejected; other errors keep their own class
+            if res.status_code not in (HTTPStatus.OK, HTTPStatus.ACCEPTED):
+                raise _error_for(res, NerisAuthError if res.status_code in (400, 401, 403) else None)
 
             got: dict = res.json()
 
             # Successfully generated tokens
             if res.status_code == HTTPStatus.OK:
-                self.tokens = TokenSet(
-                    access_token=got["access_token"],
-                    refresh_token=got["refresh_token"],
-                    expires_at=datetime.now() + timedelta(seconds=got["expires_in"]),
-                )
-
+                self._set_tokens(got)
                 break
 
             # Respond to MFA challenge
             elif res.status_code == HTTPStatus.ACCEPTED:
                 code: str = input(f"Provide MFA code for {got['challenge_name']}: ")
 
-                res = self._session.post(
-                    token_url,
-                    headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                    data={
-                        "grant_type": got["challenge_name"],
-                        "username": self.config.username,
-                        "session": got["session"],
-                        got["challenge_name"]: code,
-                    }
-                )
+                res = self._post_token(token_url, self._mfa_request(got, code))
 
-    def _call(
+    def _post_token(self, token_url: str, request: Dict[str, Any]) -> requests.Response:
+        try:
+            return self._session.post(token_url, **request, timeout=self.config.token_timeout)
+        except requests.exceptions.Timeout as e:
+            raise NerisTimeoutError(f"Token request timed out: {e}", token_url, self.config.token_timeout) from e
+
+    def _request(
         self,
         method: str,
         path: str,
-        data: Optional[str | Dict[str, Any]] = None,
+        data: Optional[str | Dict[str, Any] | "BaseModel"] = None,
         params: Optional[Dict[str, Any]] = None,
-        model: Optional[BaseModel] = None,
-    ):
-        self._update_auth()
-        self._session.headers.update({"Authorization": f"Bearer {self.tokens.access_token}"})
+        endpoint: Optional[str] = None,
+        timeout: Timeout | None = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> requests.Response:
+        body = self._encode_body(data, endpoint)
+        timeout = timeout if timeout is not None else (self.config.connect_timeout, self.config.read_timeout)
 
-        if self.config.validate and model:
-            if isinstance(data, str):
-                data = model.model_validate_json(data).model_dump(mode="json", by_alias=True)
-            if isinstance(data, dict):
-                data = model.model_validate(data).model_dump(mode="json", by_alias=True)
-
-
-        res = getattr(self._session, method)(f"{self.config.base_url}{path}", json=data, params=params)
-
-        if self.config.debug:
-            print(
-                json.dumps(
-                    {
-                        "request": {
-                            "url": f"{self.config.base_url}{path}",
-                            "body": data,
-                            "headers": self._session.headers,
-                            "params": params,
-                        },
+        url = f"{self.config.base_url}{path}"
+        policy = self.config.retry
+        self.retry_stats.record_request()
 
-                        "response": {
-                            "status_code": res.status_code,
-                            "headers": res.headers,
-                            "content": res.text,
-                        }
-                    },
-                    indent=4,
-                    cls=Encoder,
-                ),
-            )
+        for attempt in itertools.count():
+            self._recycle_idle_connections()
+            self._update_auth()
+            headers = {**self._headers(body), **(extra_headers or {})}
+
+            if self.config.rate_limiter:
+                self.config.rate_limiter.acquire(path)
+
+            self.retry_stats.record_attempt()
 
-        try:
-            res.raise_for_status()
-        except requests.exceptions.HTTPError as e:
             try:
-                e.args = e.args + (e.response.json(),)
-            except requests.exceptions.JSONDecodeError as f:
-                e.args = e.args + (e.response.text,)
-            finally:
-                print(str(e))
-                return res
+                res = getattr(self._session, method)(url, data=body, params=params, headers=headers, timeout=timeout)
+            except requests.exceptions.Timeout as e:
+                if not self._can_retry(method, attempt, idempotent):
+                    raise NerisTimeoutError(f"Request timed out: {e}", url, timeout) from e
+
+                reason, retry_after = "timeout", None
+            except requests.exceptions.ConnectionError:
+                if not self._can_retry(method, attempt, idempotent):
+                    raise
+
+                reason, retry_after = "connection_error", None
+            else:
+                if self._debug.sampled():
+                    request = {"body": body, "headers": {**self._session.headers, **headers}, "params": params}
+                    self._debug.exchange("request", method, url, res, request)
+
+                if res.status_code not in policy.status_forcelist or not self._can_retry(method, attempt, idempotent):
+                    return res
+
+                reason, retry_after = res.status_code, policy.parse_retry_after(res.headers)
+
+            self.retry_stats.record_retry(reason)
+            time.sleep(policy.backoff(attempt, retry_after))
+
+    def _replayed(self, key: str, path: str) -> CachedResponse | None:
+        # A submission the ledger has seen accepted resolves to its incident without being sent again
+        neris_id = self.config.ledger.get(key) if self.config.ledger else None
+
+        return _created(path, neris_id) if neris_id is not None else None
+
+    def _settle(self, key: str, path: str, res: Any, confirmed: bool = False) -> Any:
+        """Records an accepted incident submission, and resolves a duplicate to the incident it duplicates.
+
+        A `409` resolves to the NERIS ID in its body, or to `key` once `confirmed` shows an incident with
+        that NERIS ID exists. Otherwise it is returned as is, and not recorded.
+        """
+        neris_id = None
+
+        if res.status_code in (HTTPStatus.OK, HTTPStatus.CREATED):
+            neris_id = _neris_id_of(res)
+        elif res.status_code == HTTPStatus.CONFLICT:
+            neris_id = _neris_id_of(res) or (key if confirmed else None)
+            res = _created(path, neris_id) if neris_id is not None else res
+
+        if neris_id is not None and self.config.ledger:
+            self.config.ledger.record(key, neris_id)
+
+        return res
+
+    def _create_incident(self, path: str, data: Any, timeout: Timeout | None = None) -> CachedResponse | requests.Response:
+        body = self._encode_body(data, "create_incident")
+        key = incident_key(path.rsplit("/", 1)[1], body)
+
+        replayed = self._replayed(key, path)
+        if replayed is not None:
+            return replayed
+
+        # Submissions keyed by their NERIS ID can be retried like any idempotent request, since a duplicate resolves to the original
+        res = self._request(
+            "post", path, body, endpoint="create_incident", timeout=timeout, extra_headers={"Idempotency-Key": key}, idempotent=_is_neris_id(key)
+        )
+
+        return self._settle(key, path, res, self._conflict_confirmed(key, path, res, timeout))
+
+    def _conflict_confirmed(self, key: str, path: str, res: Any, timeout: Timeout | None) -> bool:
+        # A 409 that doesn't name the incident it conflicts with is checked against the incident `key` names
+        if res.status_code != HTTPStatus.CONFLICT or not _is_neris_id(key) or _neris_id_of(res) is not None:
+            return False
+
+        return self._request("get", f"{path}/{key}", timeout=timeout).status_code == HTTPStatus.OK
 
+    def _cached_get(
+        self, path: str, params: Optional[Dict[str, Any]], endpoint: Optional[str], timeout: Timeout | None
+    ) -> CachedResponse | requests.Response:
+        cache = self.config.cache
+        key = cache.key(self._token_key, path, params)
+        entry, fresh = cache.lookup(key)
+
+        if fresh:
+            cache.stats.record("hits")
+            return entry
+
+        res = self._request("get", path, params=params, endpoint=endpoint, timeout=timeout, extra_headers=entry and entry.validators)
+
+        if res.status_code == HTTPStatus.NOT_MODIFIED and entry is not None:
+            cache.touch(key, entry)
+            cache.stats.record("hits")
+            cache.stats.record("revalidated")
+            return entry
+
+        cache.stats.record("misses")
+
+        if res.status_code == HTTPStatus.OK:
+            return cache.store(key, res, path)
+
+        return res
+
+    def _write(
+        self,
+        method: str,
+        path: str,
+        data: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        timeout: Timeout | None = None,
+    ):
+        # Every write, whether or not it succeeded, may have changed what cached reads of its path return
         try:
-            response = res.json()
-        except requests.exceptions.JSONDecodeError:
-            response = res.text
+            if endpoint == "create_incident":
+                return self._create_incident(path, data, timeout)
+
+            return self._request(method, path, data, params, endpoint, timeout)
+        finally:
+            if self.config.cache is not None:
+                self.config.cache.invalidate(path)
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        data: Optional[str | Dict[str, Any] | "BaseModel"] = None,
+        params: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        timeout: Timeout | None = None,
+    ):
+        if self.config.cache is not None and method == "get":
+            res = self._cached_get(path, params, endpoint, timeout)
+        elif method == "get":
+            res = self._request(method, path, data, params, endpoint, timeout)
+        else:
+            res = self._write(method, path, data, params, endpoint, timeout)
+
+        if isinstance(res, CachedResponse):
+            return self._decode_response(res, endpoint)
 
-        return response
+        _raise_for_status(res)
 
+        return self._decode_response(res, endpoint)
 
-class NerisApiClient(_NerisApiClient):
-    def health(self):
-        return self._call("get", "/health")
 
-    def get_entity(self, neris_id: str) -> Dict[str, Any]:
-        return self._call("get", f"/entity/{neris_id}")
+class _NerisApiEndpoints:
+    def health(self, timeout: Timeout | None = None):
+        return self._call("get", "/health", endpoint="health", timeout=timeout)
 
-    def create_entity(self, body: str | Dict[str, Any]) -> Dict[str, Any]:
-        return self._call("post", "/entity/", body, model=CreateDepartmentPayload)
+    def get_entity(self, neris_id: str, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("get", f"/entity/{neris_id}", endpoint="get_entity", timeout=timeout)
 
-    def update_entity(self, neris_id: str, body: str | Dict[str, Any]) -> Dict[str, Any]:
-        return self._call("put", f"/entity/{neris_id}", body, model=DepartmentPayload)
+    def list_entities(
+        self,
+        page_number: int | None = None,
+        page_size: int | None = None,
+        sort_by: "DeptSortBy | str | None" = None,
+        sort_direction: "SortDirection | str | None" = None,
+        timeout: Timeout | None = None,
+    ) -> Dict[str, Any]:
+        return self._call(
+            "get",
+            "/entity",
+            params=_query(page_number=page_number, page_size=page_size, sort_by=sort_by, sort_direction=sort_direction),
+            endpoint="list_entities",
+            timeout=timeout,
+        )
+
+    def create_entity(self, body: "str | Dict[str, Any] | CreateDepartmentPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("post", "/entity/", body, endpoint="create_entity", timeout=timeout)
+
+    def update_entity(self, neris_id: str, body: "str | Dict[str, Any] | DepartmentPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("put", f"/entity/{neris_id}", body, endpoint="update_entity", timeout=timeout)
 
-    def get_user(self, sub: str | UUID) -> Dict[str, Any]:
-        return self._call("get", f"/user/{sub}")
+    def get_user(self, sub: str | UUID, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("get", f"/user/{sub}", endpoint="get_user", timeout=timeout)
 
-    def create_user(self, body: str | Dict[str, Any]) -> Dict[str, Any]:
-        return self._call("post", "/user", body, model=CreateUserPayload)
+    def list_users(self, page_number: int | None = None, page_size: int | None = None, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("get", "/user", params=_query(page_number=page_number, page_size=page_size), endpoint="list_users", timeout=timeout)
 
-    def update_user(self, sub: str | UUID, body: str | Dict[str, Any]) -> Dict[str, Any]:
-        return self._call("put", f"/user/{sub}", body, model=UpdateUserPayload)
+    def create_user(self, body: "str | Dict[str, Any] | CreateUserPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("post", "/user", body, endpoint="create_user", timeout=timeout)
 
-    def delete_user(self, sub: str | UUID) -> None:
-        self._call("delete", f"/user/{sub}")
+    def update_user(self, sub: str | UUID, body: "str | Dict[str, Any] | UpdateUserPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("put", f"/user/{sub}", body, endpoint="update_user", timeout=timeout)
 
-    def create_user_role_entity_set_attachment(self, sub_user: str | UUID, nuid_role: str | UUID, nuid_entity_set: str | UUID) -> Dict[str, Any]:
+    def delete_user(self, sub: str | UUID, timeout: Timeout | None = None) -> None:
+        return self._call("delete", f"/user/{sub}", endpoint="delete_user", timeout=timeout)
+
+    def create_user_role_entity_set_attachment(self, sub_user: str | UUID, nuid_role: str | UUID, nuid_entity_set: str | UUID, timeout: Timeout | None = None) -> Dict[str, Any]:
         return self._call(
             "post",
             "/auth/user_role_entity_set_attachment",
             params={"sub_user": str(sub_user), "nuid_role": str(nuid_role), "nuid_entity_set": str(nuid_entity_set)},
+            endpoint="create_user_role_entity_set_attachment",
+            timeout=timeout,
         )
 
-    def create_user_entity_membership(self, sub: str | UUID, neris_id: str) -> None:
-        self._call("post", f"/user/{sub}/user_entity_membership/{neris_id}")
+    def create_user_entity_membership(self, sub: str | UUID, neris_id: str, timeout: Timeout | None = None) -> None:
+        return self._call("post", f"/user/{sub}/user_entity_membership/{neris_id}", endpoint="create_user_entity_membership", timeout=timeout)
 
-    def delete_user_entity_membership(self, sub: str | UUID, neris_id: str) -> None:
-        self._call("delete", f"/user/{sub}/user_entity_membership/{neris_id}")
+    def delete_user_entity_membership(self, sub: str | UUID, neris_id: str, timeout: Timeout | None = None) -> None:
+        return self._call("delete", f"/user/{sub}/user_entity_membership/{neris_id}", endpoint="delete_user_entity_membership", timeout=timeout)
 
-    def update_user_entity_activation(self, sub: str | UUID, neris_id: str, active: bool) -> None:
-        self._call(
+    def update_user_entity_activation(self, sub: str | UUID, neris_id: str, active: bool, timeout: Timeout | None = None) -> None:
+        return self._call(
             "put",
             f"/user/{sub}/user_entity_activation/{neris_id}",
             data={"active": active},
+            endpoint="update_user_entity_activation",
+            timeout=timeout,
         )
 
-    def list_user_entity_memberships(self, sub: str | UUID) -> List[Dict[str, Any]]:
-        return self._call("get", f"/user/{sub}/user_entity_membership")
+    def list_user_entity_memberships(self, sub: str | UUID, timeout: Timeout | None = None) -> List[Dict[str, Any]]:
+        return self._call("get", f"/user/{sub}/user_entity_membership", endpoint="list_user_entity_memberships", timeout=timeout)
+
+    def create_incident(self, neris_id: str, body: "str | Dict[str, Any] | IncidentPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("post", f"/incident/{neris_id}", data=body, endpoint="create_incident", timeout=timeout)
 
-    def create_incident(self, neris_id: str, body: str | Dict[str, Any]) -> Dict[str, Any]:
-        return self._call("post", f"/incident/{neris_id}", data=body, model=IncidentPayload)
+    def validate_incident(self, neris_id: str, body: "str | Dict[str, Any] | IncidentPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call(
+            "post", f"/incident/{neris_id}/validate", data=body, endpoint="validate_incident", timeout=timeout
+        )
 
-    def validate_incident(self, neris_id: str, body: str | Dict[str, Any]) -> Dict[str, Any]:
+    def list_incidents(
+        self,
+        neris_id_entity: str,
+        cursor: str | None = None,
+        page_size: int | None = None,
+        sort_by: "IncidentSortBy | str | None" = None,
+        sort_direction: "SortDirection | str | None" = None,
+        last_modified_start: datetime | None = None,
+        timeout: Timeout | None = None,
+    ) -> Dict[str, Any]:
         return self._call(
-            "post", f"/incident/{neris_id}/validate", data=body, model=IncidentPayload
+            "get",
+            f"/incident/{neris_id_entity}",
+            params=_query(
+                cursor=cursor,
+                page_size=page_size,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+                last_modified_start=last_modified_start,
+            ),
+            endpoint="list_incidents",
+            timeout=timeout,
         )
 
-    def patch_entity(self, neris_id: str, body: str | Dict[str, Any]) -> Dict[str, Any]:
-        return self._call("patch", f"/entity/{neris_id}", data=body, model=PatchDepartmentPayload)
+    def patch_entity(self, neris_id: str, body: "str | Dict[str, Any] | PatchDepartmentPayload", timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("patch", f"/entity/{neris_id}", data=body, endpoint="patch_entity", timeout=timeout)
 
     def patch_station(
-        self, neris_id_entity: str, neris_id_station: str, body: str | Dict[str, Any]
+        self,
+        neris_id_entity: str,
+        neris_id_station: str,
+        body: "str | Dict[str, Any] | PatchStationPayload",
+        timeout: Timeout | None = None,
     ) -> Dict[str, Any]:
         return self._call(
             "patch",
             f"/entity/{neris_id_entity}/station/{neris_id_station}",
             data=body,
-            model=PatchStationPayload,
+            endpoint="patch_station",
+            timeout=timeout,
         )
 
     def patch_unit(
@@ -285,42 +701,157 @@ class NerisApiClient(_NerisApiClient):
         neris_id_entity: str,
         neris_id_station: str,
         neris_id_unit: str,
-        body: str | Dict[str, Any],
+        body: "str | Dict[str, Any] | PatchUnitPayload",
+        timeout: Timeout | None = None,
     ) -> Dict[str, Any]:
         return self._call(
             "patch",
-            f"/entity/{neris_id}/station/{neris_id_station}/unit/{neris_id_unit}",
+            f"/entity/{neris_id_entity}/station/{neris_id_station}/unit/{neris_id_unit}",
             data=body,
-            model=PatchUnitPayload,
+            endpoint="patch_unit",
+            timeout=timeout,
         )
 
     def patch_incident(
-        self, neris_id_entity: str, neris_id_incident: str, body: str | Dict[str, Any]
+        self,
+        neris_id_entity: str,
+        neris_id_incident: str,
+        body: "str | Dict[str, Any] | PatchIncidentAction",
+        timeout: Timeout | None = None,
     ) -> Dict[str, Any]:
         return self._call(
             "patch",
             f"/incident/{neris_id_entity}/{neris_id_incident}",
             data=body,
-            model=PatchIncidentAction,
+            endpoint="patch_incident",
+            timeout=timeout,
         )
 
     def update_incident_status(
-        self, neris_id_entity: str, neris_id_incident: str, status: TypeIncidentStatusValue
+        self,
+        neris_id_entity: str,
+        neris_id_incident: str,
+        status: "TypeIncidentStatusValue",
+        timeout: Timeout | None = None,
     ) -> Dict[str, Any]:
         return self._call(
             "put",
             f"/incident/{neris_id_entity}/{neris_id_incident}/status",
             data={"status": str(status)},
+            endpoint="update_incident_status",
+            timeout=timeout,
         )
 
-    def create_api_integration(self, neris_id: str, title: str) -> Dict[str, Any]:
-        return self._call("post", f"/account/integration/{neris_id}", data={ "title": title })
+    def create_api_integration(self, neris_id: str, title: str, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("post", f"/account/integration/{neris_id}", data={ "title": title }, endpoint="create_api_integration", timeout=timeout)
+
+    def generate_api_secret(self, client_id: str, title: str, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("post", f"/account/credential/{client_id}", data={ "title": title }, endpoint="generate_api_secret", timeout=timeout)
+
+    def list_integrations(self, neris_id: str, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("get", f"/account/integration/{neris_id}/list", endpoint="list_integrations", timeout=timeout)
+
+    def enroll_integration(self, neris_id: str, client_id: UUID | str, timeout: Timeout | None = None) -> Dict[str, Any]:
+        return self._call("post", f"/account/enrollment/{neris_id}/{client_id}", endpoint="enroll_integration", timeout=timeout)
+
+
+class NerisApiClient(_NerisApiClient, _NerisApiEndpoints):
+    def create_incidents(
+        self,
+        neris_id: str,
+        bodies: "Iterable[str | Dict[str, Any] | IncidentPayload]",
+        concurrency: int = 8,
+        ordered: bool = True,
+        timeout: Timeout | None = None,
+    ) -> Iterator[BulkResult]:
+        """Submits incidents with up to `concurrency` requests in flight, yielding one result per body.
+
+        Results are yielded in input order, or as they complete if `ordered` is false. Bodies are pulled
+        from the iterable as requests complete, so it can be a lazy stream of any length. Set
+        `Config.pool_maxsize` to at least `concurrency` so each request has a pooled connection.
+        """
+        def submit(item) -> BulkResult:
+            index, body = item
+
+            try:
+                res = self._write("post", f"/incident/{neris_id}", body, endpoint="create_incident", timeout=timeout)
+            except Exception as e:
+                return BulkResult(index, error=e)
+
+            return self._bulk_result(index, res)
+
+        return _bounded_map(submit, enumerate(bodies), concurrency, ordered)
+
+    def _iter_pages(
+        self, path: str, endpoint: str, items: str, params: Dict[str, Any], concurrency: int, timeout: Timeout | None
+    ) -> Iterator[Any]:
+        def fetch(page_number: int) -> Any:
+            return self._fetch(path, _query(page_number=page_number, **params), endpoint, timeout)
+
+        # The first page gives the page count, so the rest can be fetched at once
+        first = fetch(1)
+        yield from _page_field(first, items) or []
+
+        for page in _bounded_map(fetch, range(2, _page_field(first, "page_count") + 1), concurrency):
+            yield from _page_field(page, items) or []
+
+    def iter_entities(
+        self,
+        sort_by: "DeptSortBy | str | None" = None,
+        sort_direction: "SortDirection | str | None" = None,
+        page_size: int | None = None,
+        concurrency: int = 4,
+        timeout: Timeout | None = None,
+    ) -> Iterator[Any]:
+        """Yields every entity in order, fetching up to `concurrency` pages at a time after the first."""
+        params = {"page_size": page_size, "sort_by": sort_by, "sort_direction": sort_direction}
+        return self._iter_pages("/entity", "list_entities", "entities", params, concurrency, timeout)
+
+    def iter_users(self, page_size: int | None = None, concurrency: int = 4, timeout: Timeout | None = None) -> Iterator[Any]:
+        """Yields every user in order, fetching up to `concurrency` pages at a time after the first."""
+        return self._iter_pages("/user", "list_users", "users", {"page_size": page_size}, concurrency, timeout)
+
+    def iter_incidents(
+        self,
+        neris_id_entity: str,
+        sort_by: "IncidentSortBy | str | None" = None,
+        sort_direction: "SortDirection | str | None" = None,
+        page_size: int | None = None,
+        last_modified_start: datetime | None = None,
+        timeout: Timeout | None = None,
+    ) -> Iterator[Any]:
+        """Yields every incident of an entity, following the listing's cursors.
+
+        The next page is fetched in the background while the current one is consumed, so a caller
+        that keeps up with the API waits for one round trip in total rather than one per page.
+        `last_modified_start` asks for only the incidents modified at or after that time. It is not part
+        of the published API models, so a server may ignore it and list every incident.
+        """
+        def fetch(cursor: str | None) -> Any:
+            params = _query(
+                cursor=cursor,
+                page_size=page_size,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+                last_modified_start=last_modified_start,
+            )
+            return self._fetch(f"/incident/{neris_id_entity}", params, "list_incidents", timeout)
+
+        pool = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            page = fetch(None)
+
+            while True:
+                incidents = _page_field(page, "incidents")
+                cursor = _page_field(page, "next_cursor")
+                upcoming = pool.submit(fetch, cursor) if cursor and incidents else None
 
-    def generate_api_secret(self, client_id: str, title: str) -> Dict[str, Any]:
-        return self._call("post", f"/account/credential/{client_id}", data={ "title": title })
+                yield from incidents
 
-    def list_integrations(self, neris_id: str) -> Dict[str, Any]:
-        return self._call("get", f"/account/integration/{neris_id}/list")
+                if upcoming is None:
+                    return
 
-    def enroll_integration(self, neris_id: str, client_id: UUID | str) -> Dict[str, Any]:
-        return self._call("post", f"/account/enrollment/{neris_id}/{client_id}")
+                page = upcoming.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
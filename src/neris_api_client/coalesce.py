@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+
+from .client import _bounded_map
+from .debug import logger
+from .exceptions import _error_for
+from .patch import _dump, _merge
+
+if TYPE_CHECKING:
+    from .client import NerisApiClient
+    from .models import PatchIncidentAction
+
+__all__ = ("PatchQueue", "PatchResult")
+
+Key = Tuple[str, str]
+
+
+@dataclass
+class PatchResult:
+    neris_id_entity: str
+    neris_id_incident: str
+    merged: int
+    status_code: int | None = None
+    error: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Pending:
+    patch: Dict[str, Any]
+    merged: int
+    deadline: float
+
+
+class PatchQueue:
+    """Buffers incident patches and sends those for each incident as a single request.
+
+    The first patch submitted for an incident opens a window of `window` seconds. Patches submitted
+    for the same incident within it are merged into one, as by `merge_patches`, which is sent when the
+    window closes. A patch that cannot be merged with the pending one causes the pending one to be
+    sent first. Results are passed to `on_result` as they arrive, from a background thread for
+    patches sent when their window closes.
+
+    `close`, or leaving the queue's `with` block, sends whatever is still pending.
+    """
+
+    def __init__(
+        self,
+        client: "NerisApiClient",
+        window: float = 2.0,
+        on_result: Callable[[PatchResult], None] | None = None,
+        concurrency: int = 4,
+    ):
+        self.client = client
+        self.window = window
+        self.on_result = on_result
+        self.concurrency = concurrency
+        self._pending: Dict[Key, _Pending] = {}
+        self._cond = threading.Condition()
+        # Held while sending so that patches of an incident are never sent out of order
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._flusher: threading.Thread | None = None
+
+    def __enter__(self) -> "PatchQueue":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def submit(self, neris_id_entity: str, neris_id_incident: str, patch: "PatchIncidentAction | Dict[str, Any]") -> None:
+        key = (neris_id_entity, neris_id_incident)
+        patch = _dump(patch)
+
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("PatchQueue is closed")
+
+                pending = self._pending.get(key)
+
+                if pending is None:
+                    self._pending[key] = _Pending(patch, 1, time.monotonic() + self.window)
+                    self._cond.notify()
+
+                    if self._flusher is None:
+                        self._flusher = threading.Thread(target=self._flush_in_background, daemon=True)
+                        self._flusher.start()
+                    return
+
+                try:
+                    pending.patch = _merge(pending.patch, patch)
+                    pending.merged += 1
+                    return
+                except ValueError:
+                    pass
+
+            # The pending patch can't absorb this one, so it goes out now and this one starts a new window
+            self._send_due(lambda k, _: k == key)
+
+    def flush(self) -> List[PatchResult]:
+        """Sends every pending patch now, without waiting for its window to close."""
+        return self._send_due(lambda *_: True)
+
+    def close(self) -> List[PatchResult]:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+        results = self.flush()
+
+        if self._flusher is not None:
+            self._flusher.join()
+
+        return results
+
+    def _flush_in_background(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+
+                now = time.monotonic()
+                deadline = min((pending.deadline for pending in self._pending.values()), default=None)
+
+                if deadline is None or deadline > now:
+                    self._cond.wait(None if deadline is None else deadline - now)
+                    continue
+
+            self._send_due(lambda _, pending: pending.deadline <= time.monotonic())
+
+    def _send_due(self, due: Callable[[Key, _Pending], bool]) -> List[PatchResult]:
+        with self._send_lock:
+            with self._cond:
+                batch = [(key, self._pending.pop(key)) for key, pending in list(self._pending.items()) if due(key, pending)]
+
+            results = list(_bounded_map(self._send, batch, self.concurrency)) if batch else []
+
+        if self.on_result is not None:
+            for result in results:
+                # A failing callback must not stop the flusher, which would leave later patches pending
+                try:
+                    self.on_result(result)
+                except Exception:
+                    logger.exception("PatchQueue on_result callback failed")
+
+        return results
+
+    def _send(self, item: Tuple[Key, _Pending]) -> PatchResult:
+        (neris_id_entity, neris_id_incident), pending = item
+
+        try:
+            res = self.client._write(
+                "patch", f"/incident/{neris_id_entity}/{neris_id_incident}", data=pending.patch, endpoint="patch_incident"
+            )
+
+            # Patch responses carry nothing a PatchResult holds, so only error bodies are decoded
+            error = _error_for(res) if res.status_code >= 400 else None
+        except Exception as e:
+            return PatchResult(neris_id_entity, neris_id_incident, pending.merged, error=e)
+
+        return PatchResult(neris_id_entity, neris_id_incident, pending.merged, res.status_code, error)
@@ -2,28 +2,91 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 import os
+from typing import Any
+
+from .cache import ResponseCache
+from .ledger import Ledger, SQLiteLedger
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
 
 class GrantType(str, Enum):
     CLIENT_CREDENTIALS = "client_credentials"
     PASSWORD = "password"
 
+class ResponseMode(str, Enum):
+    JSON = "json"
+    MODEL = "model"
+    LAZY = "lazy"
+
 @dataclass
 class Config:
     base_url: str | None = None
     debug: bool | None = None
+    debug_sample_rate: float | None = None
+    debug_max_body: int | None = None
     username: str | None = None
     password: str | None = None
     client_id: str | None = None
     client_secret: str | None = None
     grant_type: GrantType | None = None
     validate: bool | None = None
+    pool_connections: int | None = None
+    pool_maxsize: int | None = None
+    pool_keepalive: float | None = None
+    token_refresh_skew: float | None = None
+    token_refresh_background: bool | None = None
+    token_store: Any = None
+    token_store_path: str | None = None
+    retry: RetryPolicy | None = None
+    rate_limiter: RateLimiter | None = None
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
+    token_timeout: float | None = None
+    response_mode: ResponseMode | None = None
+    cache: ResponseCache | None = None
+    ledger: Ledger | None = None
 
     def __post_init__(self):
         # env var handling
         self.base_url = self.base_url or os.getenv("NERIS_BASE_URL")
         self.debug = self.debug if self.debug is not None else os.getenv("NERIS_DEBUG") == "true"
+        self.debug_sample_rate = self.debug_sample_rate if self.debug_sample_rate is not None else float(os.getenv("NERIS_DEBUG_SAMPLE_RATE", 1))
+        self.debug_max_body = self.debug_max_body if self.debug_max_body is not None else int(os.getenv("NERIS_DEBUG_MAX_BODY", 2048))
         self.validate = self.validate if self.validate is not None else os.getenv("NERIS_VALIDATE") == "true"
 
+        # connection pool handling
+        self.pool_connections = self.pool_connections or int(os.getenv("NERIS_POOL_CONNECTIONS", 10))
+        self.pool_maxsize = self.pool_maxsize or int(os.getenv("NERIS_POOL_MAXSIZE", 10))
+        self.pool_keepalive = self.pool_keepalive if self.pool_keepalive is not None else float(os.getenv("NERIS_POOL_KEEPALIVE", 60))
+
+        # token refresh handling
+        self.token_refresh_skew = self.token_refresh_skew if self.token_refresh_skew is not None else float(os.getenv("NERIS_TOKEN_REFRESH_SKEW", 60))
+        self.token_refresh_background = self.token_refresh_background if self.token_refresh_background is not None else os.getenv("NERIS_TOKEN_REFRESH_BACKGROUND") == "true"
+        self.token_store_path = self.token_store_path or os.getenv("NERIS_TOKEN_STORE_PATH")
+
+        # retry handling
+        self.retry = self.retry if self.retry is not None else RetryPolicy(total=int(os.getenv("NERIS_RETRY_TOTAL", 3)))
+
+        # timeout handling
+        self.connect_timeout = self.connect_timeout or float(os.getenv("NERIS_CONNECT_TIMEOUT", 10))
+        self.read_timeout = self.read_timeout or float(os.getenv("NERIS_READ_TIMEOUT", 60))
+        self.token_timeout = self.token_timeout or float(os.getenv("NERIS_TOKEN_TIMEOUT", 10))
+
+        # response decoding
+        self.response_mode = ResponseMode(self.response_mode or os.getenv("NERIS_RESPONSE_MODE", ResponseMode.JSON))
+
+        # response cache handling
+        if self.cache is None and os.getenv("NERIS_CACHE_TTL"):
+            self.cache = ResponseCache(ttl=float(os.getenv("NERIS_CACHE_TTL")), path=os.getenv("NERIS_CACHE_PATH"))
+
+        # incident submission ledger handling
+        if self.ledger is None and os.getenv("NERIS_LEDGER_PATH"):
+            self.ledger = SQLiteLedger(os.getenv("NERIS_LEDGER_PATH"))
+
+        # rate limit handling
+        if self.rate_limiter is None and os.getenv("NERIS_RATE_LIMIT"):
+            self.rate_limiter = RateLimiter(float(os.getenv("NERIS_RATE_LIMIT")), int(os.getenv("NERIS_RATE_BURST", 1)))
+
         match os.getenv("NERIS_GRANT_TYPE"):
             case GrantType.PASSWORD:
                 self.grant_type = self.grant_type or GrantType.PASSWORD
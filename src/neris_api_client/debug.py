@@ -0,0 +1,102 @@
+import json
+import logging
+import random
+import re
+from typing import Any, Dict, Mapping
+
+logger = logging.getLogger("neris_api_client")
+
+# Headers and JSON fields whose values are never logged
+_REDACTED_HEADERS = frozenset({"authorization", "cookie", "set-cookie", "proxy-authorization"})
+_REDACTED_VALUES = re.compile(r'("(?:access_token|refresh_token|id_token|password|client_secret|session)"\s*:\s*)"[^"]*"?')
+
+
+class Encoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, Mapping):
+            return {k: v for k, v in obj.items()}
+
+        if isinstance(obj, bytes):
+            return obj.decode("utf-8", errors="replace")
+
+        return super().default(obj)
+
+
+def _headers(headers: Mapping | None) -> Dict[str, Any]:
+    return {k: "<redacted>" if k.lower() in _REDACTED_HEADERS else v for k, v in (headers or {}).items()}
+
+
+def _body(content: bytes | str | None, limit: int) -> str | None:
+    if content is None:
+        return None
+
+    # Cut before decoding and redacting, so large bodies cost no more to log than small ones
+    more = len(content) - limit
+    text = content[:limit].decode("utf-8", errors="replace") if isinstance(content, bytes) else content[:limit]
+    text = _REDACTED_VALUES.sub(r'\1"<redacted>"', text)
+
+    return f"{text}... ({more} more bytes)" if more > 0 else text
+
+
+class _Exchange:
+    """A request and its response, formatted only if a handler emits the record."""
+
+    __slots__ = ("request", "res", "limit")
+
+    def __init__(self, request: Dict[str, Any] | None, res: Any, limit: int):
+        self.request = request
+        self.res = res
+        self.limit = limit
+
+    def __str__(self) -> str:
+        got = {}
+
+        if self.request is not None:
+            got["request"] = {
+                **self.request,
+                "headers": _headers(self.request.get("headers")),
+                "body": _body(self.request.get("body"), self.limit),
+            }
+
+        got["response"] = {
+            "status_code": self.res.status_code,
+            "headers": _headers(self.res.headers),
+            "content": _body(self.res.content, self.limit),
+        }
+
+        return json.dumps(got, indent=4, cls=Encoder)
+
+
+class _Debug:
+    """Sampled, redacted debug logging of API exchanges to the `neris_api_client` logger."""
+
+    def __init__(self, enabled: bool, sample_rate: float, max_body: int):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_body = max_body
+
+        # Keep `Config.debug` useful without any logging setup, as when it printed to stdout
+        if enabled and not logger.hasHandlers():
+            logger.addHandler(logging.StreamHandler())
+        if enabled and logger.getEffectiveLevel() > logging.DEBUG:
+            logger.setLevel(logging.DEBUG)
+
+    def sampled(self) -> bool:
+        return self.enabled and logger.isEnabledFor(logging.DEBUG) and (self.sample_rate >= 1 or random.random() < self.sample_rate)
+
+    def exchange(self, kind: str, method: str, url: str, res: Any, request: Dict[str, Any] | None = None) -> None:
+        elapsed = getattr(res, "elapsed", None)
+        elapsed = elapsed.total_seconds() if elapsed is not None else None
+
+        logger.debug(
+            "%s %s %s -> %s\n%s",
+            kind,
+            method.upper(),
+            url,
+            res.status_code,
+            _Exchange(request, res, self.max_body),
+            extra={"neris_method": method.upper(), "neris_url": url, "neris_status": res.status_code, "neris_elapsed": elapsed},
+        )
+
+    def refresh_failed(self, error: Exception) -> None:
+        logger.warning("Token refresh failed, the current token is used until it expires: %s", error)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel, TypeAdapter
+
+__all__ = ("Endpoint", "ENDPOINTS")
+
+
+def _load_model(name: str) -> "type[BaseModel]":
+    # The generated models are imported on first use, as importing them is most of the package's import time
+    from . import models
+
+    return getattr(models, name)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(name: str) -> "TypeAdapter":
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(List[_load_model(name)])
+
+
+def _build(model: "type[BaseModel]") -> None:
+    # Models are generated with `defer_build`, so their validators are otherwise built on first use
+    if not model.__pydantic_complete__:
+        model.model_rebuild()
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Names of the models that validate an endpoint's request body and its response."""
+
+    request_model: str | None = None
+    response_model: str | None = None
+    response_many: bool = False
+
+    def request_validator(self) -> "type[BaseModel] | None":
+        return _load_model(self.request_model) if self.request_model else None
+
+    def response_validator(self) -> "type[BaseModel] | TypeAdapter | None":
+        if self.response_model is None:
+            return None
+
+        if self.response_many:
+            return _list_adapter(self.response_model)
+
+        return _load_model(self.response_model)
+
+    def warmup(self) -> None:
+        for validator in (self.request_validator(), self.response_validator()):
+            if validator is not None and hasattr(validator, "model_rebuild"):
+                _build(validator)
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    "health": Endpoint(),
+    "get_entity": Endpoint(response_model="DepartmentResponse"),
+    "list_entities": Endpoint(response_model="ListEntitiesSummaryInfoResponse"),
+    "create_entity": Endpoint("CreateDepartmentPayload", "DepartmentCreatedModifiedResponse"),
+    "update_entity": Endpoint("DepartmentPayload", "DepartmentCreatedModifiedResponse"),
+    "patch_entity": Endpoint("PatchDepartmentPayload", "DepartmentCreatedModifiedResponse"),
+    "patch_station": Endpoint("PatchStationPayload", "StationCreatedModifiedResponse"),
+    "patch_unit": Endpoint("PatchUnitPayload", "UnitCreatedModifiedResponse"),
+    "get_user": Endpoint(response_model="UserInfoResponse"),
+    "list_users": Endpoint(response_model="ListUserInfoResponse"),
+    "create_user": Endpoint("CreateUserPayload", "UserInfoResponse"),
+    "update_user": Endpoint("UpdateUserPayload", "UserInfoResponse"),
+    "delete_user": Endpoint(),
+    "create_user_role_entity_set_attachment": Endpoint(response_model="UserRoleEntitySetAttachmentResponse"),
+    "create_user_entity_membership": Endpoint(),
+    "delete_user_entity_membership": Endpoint(),
+    "update_user_entity_activation": Endpoint(),
+    "list_user_entity_memberships": Endpoint(response_model="UserEntitySummaryInfoResponse", response_many=True),
+    "create_incident": Endpoint("IncidentPayload", "IncidentCreatedResponse"),
+    "validate_incident": Endpoint("IncidentPayload"),
+    "list_incidents": Endpoint(response_model="ListIncidentsResponse"),
+    "patch_incident": Endpoint("PatchIncidentAction"),
+    "update_incident_status": Endpoint(response_model="UpdateIncidentStatusResponse"),
+    "create_api_integration": Endpoint(response_model="CreateIntegrationResponse"),
+    "generate_api_secret": Endpoint(),
+    "list_integrations": Endpoint(response_model="ListIntegrationResponse"),
+    "enroll_integration": Endpoint(response_model="IntegrationEnrollmentResponse"),
+}
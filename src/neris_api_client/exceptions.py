@@ -0,0 +1,120 @@
+from functools import cached_property
+from typing import Any, TYPE_CHECKING
+
+from .retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from .models import HTTPValidationError
+
+__all__ = (
+    "NerisApiError",
+    "NerisTimeoutError",
+    "NerisHTTPError",
+    "NerisAuthError",
+    "NerisNotFound",
+    "NerisValidationError",
+    "NerisRateLimited",
+    "NerisServerError",
+)
+
+
+class NerisApiError(Exception):
+    """Base class for errors raised by the NERIS API client."""
+
+
+class NerisTimeoutError(NerisApiError):
+    """Raised when connecting to or reading from the NERIS API takes longer than the configured timeout."""
+
+    def __init__(self, message: str, url: str, timeout: float | tuple | None):
+        super().__init__(message)
+        self.url = url
+        self.timeout = timeout
+
+
+class NerisHTTPError(NerisApiError):
+    """Raised when the NERIS API answers with an error status.
+
+    `body` is the decoded JSON of the response, or its text when it isn't JSON, and `elapsed` the
+    seconds the request took. The subclasses below cover the statuses callers usually handle apart.
+    """
+
+    def __init__(self, status_code: int, body: Any, url: str, method: str | None = None, elapsed: float | None = None, response: Any = None):
+        super().__init__(f"{status_code} error for {method.upper() + ' ' if method else ''}{url}: {body}")
+        self.status_code = status_code
+        self.body = body
+        self.url = url
+        self.method = method
+        self.elapsed = elapsed
+        self.response = response
+
+
+class NerisAuthError(NerisHTTPError):
+    """Raised for `401` and `403` responses, and when tokens cannot be obtained."""
+
+
+class NerisNotFound(NerisHTTPError):
+    pass
+
+
+class NerisValidationError(NerisHTTPError):
+    """Raised for `422` responses, whose body lists the problems with the request."""
+
+    @cached_property
+    def errors(self) -> "HTTPValidationError | None":
+        from pydantic import ValidationError
+        from .endpoints import _load_model
+
+        try:
+            return _load_model("HTTPValidationError").model_validate(self.body)
+        except ValidationError:
+            return None
+
+
+class NerisRateLimited(NerisHTTPError):
+    """Raised for `429` responses once retries are exhausted. `retry_after` is the wait the API asked for, if any."""
+
+    def __init__(self, *args: Any, retry_after: float | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class NerisServerError(NerisHTTPError):
+    pass
+
+
+def _error_for(res: Any, error: "type[NerisHTTPError] | None" = None) -> NerisHTTPError:
+    """The exception for an error response from either `requests` or `httpx`, of class `error` if given."""
+    try:
+        body = res.json()
+    except ValueError:
+        body = res.text
+
+    request = getattr(res, "request", None)
+    elapsed = getattr(res, "elapsed", None)
+    context = {
+        "method": getattr(request, "method", None),
+        "elapsed": elapsed.total_seconds() if elapsed is not None else None,
+        "response": res,
+    }
+
+    if error is not None:
+        return error(res.status_code, body, str(res.url), **context)
+
+    match res.status_code:
+        case 401 | 403:
+            return NerisAuthError(res.status_code, body, str(res.url), **context)
+        case 404:
+            return NerisNotFound(res.status_code, body, str(res.url), **context)
+        case 422:
+            return NerisValidationError(res.status_code, body, str(res.url), **context)
+        case 429:
+            return NerisRateLimited(res.status_code, body, str(res.url), retry_after=RetryPolicy.parse_retry_after(res.headers), **context)
+        case status if status >= 500:
+            return NerisServerError(res.status_code, body, str(res.url), **context)
+
+    return NerisHTTPError(res.status_code, body, str(res.url), **context)
+
+
+def _raise_for_status(res: Any) -> None:
+    if res.status_code >= 400:
+        raise _error_for(res)
@@ -0,0 +1,100 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Dict
+
+__all__ = ("incident_key", "Ledger", "MemoryLedger", "SQLiteLedger")
+
+_INTERNAL_ID = re.compile(r"^[\w\-:]+$")
+
+
+def incident_key(neris_id_entity: str, body: Any) -> str:
+    """Deterministic idempotency key of an incident submission.
+
+    For payloads with a dispatch ID this is the NERIS ID the API gives the incident: the entity's
+    NERIS ID, `dispatch.internal_id` (`dispatch.incident_number` in the current models) and the epoch
+    time of `dispatch.call_create`. Other payloads are keyed by a hash of their content.
+    """
+    from pydantic_core import from_json, to_json
+
+    match body:
+        case bytes() | str():
+            payload = from_json(body)
+        case dict():
+            payload = body
+        case _:
+            payload = body.model_dump(mode="json", by_alias=True)
+
+    dispatch = payload.get("dispatch") if isinstance(payload, dict) else None
+    dispatch = dispatch if isinstance(dispatch, dict) else {}
+    # The models of this API version name the dispatch's internal ID `incident_number`
+    internal_id = dispatch.get("internal_id") or dispatch.get("incident_number")
+    created = _call_create(dispatch.get("call_create"))
+
+    if isinstance(internal_id, str) and _INTERNAL_ID.match(internal_id) and created is not None:
+        return f"{neris_id_entity}|{internal_id}|{int(created.timestamp())}"
+
+    content = json.dumps(json.loads(to_json(payload)), sort_keys=True, separators=(",", ":"))
+
+    return "sha256:" + hashlib.sha256(f"{neris_id_entity}|{content}".encode("utf-8")).hexdigest()
+
+
+def _call_create(value: Any) -> datetime | None:
+    # Pydantic writes UTC times with a `Z`, which `fromisoformat` only accepts from Python 3.11
+    try:
+        created = value if isinstance(value, datetime) else datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+    return created.replace(tzinfo=timezone.utc) if created.tzinfo is None else created
+
+
+def _is_neris_id(key: str) -> bool:
+    return not key.startswith("sha256:")
+
+
+class Ledger(ABC):
+    """Record of accepted incident submissions: the NERIS ID created for each idempotency key."""
+
+    @abstractmethod
+    def get(self, key: str) -> str | None: ...
+
+    @abstractmethod
+    def record(self, key: str, neris_id: str) -> None: ...
+
+
+class MemoryLedger(Ledger):
+    def __init__(self):
+        self._accepted: Dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self._accepted.get(key)
+
+    def record(self, key: str, neris_id: str) -> None:
+        self._accepted[key] = neris_id
+
+
+class SQLiteLedger(Ledger):
+    """Keeps the ledger in a SQLite file, so that replays after a restart are recognized too."""
+
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS accepted (key TEXT PRIMARY KEY, neris_id TEXT)")
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT neris_id FROM accepted WHERE key = ?", (key,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def record(self, key: str, neris_id: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO accepted VALUES (?, ?)", (key, neris_id))
@@ -0,0 +1,224 @@
+import hashlib
+from http import HTTPStatus
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, TYPE_CHECKING
+
+from .client import _bounded_map, _page_field
+from .exceptions import _raise_for_status
+
+if TYPE_CHECKING:
+    from .client import NerisApiClient
+
+__all__ = ("LocalMirror",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    neris_id TEXT PRIMARY KEY,
+    name TEXT,
+    state TEXT,
+    version INTEGER,
+    refreshed_at REAL,
+    data TEXT,
+    digest TEXT
+);
+CREATE INDEX IF NOT EXISTS entities_state ON entities (state);
+
+CREATE TABLE IF NOT EXISTS stations (
+    neris_id TEXT PRIMARY KEY,
+    neris_id_entity TEXT,
+    station_id TEXT,
+    state TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS stations_entity ON stations (neris_id_entity);
+CREATE INDEX IF NOT EXISTS stations_state ON stations (state);
+
+CREATE TABLE IF NOT EXISTS units (
+    neris_id TEXT PRIMARY KEY,
+    neris_id_station TEXT,
+    neris_id_entity TEXT,
+    type TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS units_station ON units (neris_id_station);
+CREATE INDEX IF NOT EXISTS units_entity ON units (neris_id_entity);
+CREATE INDEX IF NOT EXISTS units_type ON units (type, neris_id_entity);
+"""
+
+
+class LocalMirror:
+    """Copy of entities, with their stations and units, in an indexed SQLite database.
+
+    `refresh` pulls entities from the API; lookups are answered from the database alone. Entities
+    are stored as returned by `get_entity`, stations and units as nested in it, all as dicts.
+    """
+
+    def __init__(self, client: "NerisApiClient", path: str = ":memory:"):
+        self.client = client
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+
+        with self._lock:
+            if path != ":memory:":
+                self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _get_entity(self, neris_id: str) -> Tuple[str, Dict[str, Any] | None]:
+        res = self.client._request("get", f"/entity/{neris_id}", endpoint="get_entity")
+
+        if res.status_code == HTTPStatus.NOT_FOUND:
+            return neris_id, None
+
+        _raise_for_status(res)
+
+        return neris_id, res.json()
+
+    def _listed(self, listed: Set[str], concurrency: int) -> Iterator[str]:
+        for entity in self.client.iter_entities(concurrency=concurrency):
+            neris_id = _page_field(entity, "neris_id")
+            listed.add(neris_id)
+            yield neris_id
+
+    def refresh(self, neris_ids: Iterable[str] | None = None, max_age: float | None = None, concurrency: int = 8) -> int:
+        """Pulls entities into the mirror and returns how many of them had changed.
+
+        By default every entity listed by the API is pulled, and entities no longer listed are removed.
+        Entities the API no longer finds are removed too. Entities refreshed less than `max_age` seconds
+        ago are skipped, and entities unchanged along with their stations and units are not rewritten.
+        """
+        listed: Set[str] | None = None
+
+        if neris_ids is None:
+            listed = set()
+            neris_ids = self._listed(listed, concurrency)
+
+        if max_age is not None:
+            fresh = {
+                neris_id
+                for neris_id, in self._query("SELECT neris_id FROM entities WHERE refreshed_at >= ?", (time.time() - max_age,))
+            }
+            neris_ids = (neris_id for neris_id in neris_ids if neris_id not in fresh)
+
+        changed = 0
+
+        for neris_id, entity in _bounded_map(self._get_entity, neris_ids, concurrency, ordered=False):
+            changed += self._store(entity) if entity is not None else self._remove([neris_id])
+
+        # Only a complete listing shows which entities are gone
+        if listed is not None:
+            changed += self._remove([neris_id for neris_id, in self._query("SELECT neris_id FROM entities") if neris_id not in listed])
+
+        return changed
+
+    def _remove(self, neris_ids: List[str]) -> int:
+        rows = [(neris_id,) for neris_id in neris_ids]
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany("DELETE FROM units WHERE neris_id_entity = ?", rows)
+                self._db.executemany("DELETE FROM stations WHERE neris_id_entity = ?", rows)
+                removed = self._db.executemany("DELETE FROM entities WHERE neris_id = ?", rows).rowcount
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return removed
+
+    def _store(self, entity: Dict[str, Any]) -> bool:
+        neris_id = entity["neris_id"]
+        stations = entity.get("stations") or []
+        # Stations and units are versioned on their own, so the digest covers them along with the entity
+        digest = hashlib.sha256(json.dumps(entity, sort_keys=True).encode("utf-8")).hexdigest()
+
+        with self._lock:
+            stored = self._db.execute("SELECT digest FROM entities WHERE neris_id = ?", (neris_id,)).fetchone()
+
+            if stored is not None and stored[0] == digest:
+                self._db.execute("UPDATE entities SET refreshed_at = ? WHERE neris_id = ?", (time.time(), neris_id))
+                return False
+
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute("DELETE FROM units WHERE neris_id_entity = ?", (neris_id,))
+                self._db.execute("DELETE FROM stations WHERE neris_id_entity = ?", (neris_id,))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        neris_id,
+                        entity.get("name"),
+                        entity.get("state"),
+                        entity.get("version"),
+                        time.time(),
+                        json.dumps({k: v for k, v in entity.items() if k != "stations"}),
+                        digest,
+                    ),
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO stations VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            station["neris_id"],
+                            neris_id,
+                            station.get("station_id"),
+                            station.get("state"),
+                            json.dumps({k: v for k, v in station.items() if k != "units"}),
+                        )
+                        for station in stations
+                    ],
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO units VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (unit["neris_id"], station["neris_id"], neris_id, unit.get("type"), json.dumps(unit))
+                        for station in stations
+                        for unit in station.get("units") or []
+                    ],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return True
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _select(self, table: str, **filters: Any) -> List[Dict[str, Any]]:
+        filters = {column: value for column, value in filters.items() if value is not None}
+        where = " AND ".join(f"{column} = ?" for column in filters)
+
+        return [json.loads(data) for data, in self._query(f"SELECT data FROM {table} WHERE {where}", tuple(filters.values()))]
+
+    def entity(self, neris_id: str) -> Dict[str, Any] | None:
+        """The entity without its stations, which are looked up with `stations`."""
+        return next(iter(self._select("entities", neris_id=neris_id)), None)
+
+    def entities(self, state: str) -> List[Dict[str, Any]]:
+        return self._select("entities", state=state)
+
+    def station(self, neris_id: str) -> Dict[str, Any] | None:
+        """The station without its units, which are looked up with `units`."""
+        return next(iter(self._select("stations", neris_id=neris_id)), None)
+
+    def stations(self, neris_id_entity: str | None = None, state: str | None = None) -> List[Dict[str, Any]]:
+        assert neris_id_entity is not None or state is not None
+        return self._select("stations", neris_id_entity=neris_id_entity, state=state)
+
+    def unit(self, neris_id: str) -> Dict[str, Any] | None:
+        return next(iter(self._select("units", neris_id=neris_id)), None)
+
+    def units(
+        self, neris_id_station: str | None = None, type: str | None = None, neris_id_entity: str | None = None
+    ) -> List[Dict[str, Any]]:
+        assert neris_id_station is not None or type is not None or neris_id_entity is not None
+        return self._select("units", neris_id_station=neris_id_station, type=type, neris_id_entity=neris_id_entity)
@@ -9,7 +9,9 @@ from enum import Enum
 from typing import Any, Dict, List, Literal, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, RootModel, constr
+from pydantic import ConfigDict, EmailStr, Field, RootModel, constr
+
+from ._base import BaseModel
 
 
 class Actions(Enum):
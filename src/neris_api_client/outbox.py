@@ -0,0 +1,275 @@
+from dataclasses import dataclass
+from http import HTTPStatus
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+
+import requests
+
+from .client import BulkResult, _bounded_map
+from .debug import logger
+from .exceptions import NerisRateLimited, NerisServerError, NerisTimeoutError
+from .ledger import incident_key, _is_neris_id
+
+if TYPE_CHECKING:
+    from .client import NerisApiClient
+    from .models import IncidentPayload, PatchIncidentAction, TypeIncidentStatusValue
+
+__all__ = ("Outbox", "OutboxEntry")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT,
+    path TEXT,
+    endpoint TEXT,
+    body BLOB,
+    ordering TEXT,
+    state TEXT DEFAULT 'pending',
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at REAL DEFAULT 0,
+    status_code INTEGER,
+    error TEXT,
+    created_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (state, ordering, id);
+"""
+
+# Errors that leave a submission queued, including those of the token request made for it
+_TRANSIENT = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    NerisTimeoutError,
+    NerisServerError,
+    NerisRateLimited,
+)
+
+# The oldest pending submission of each incident, and every pending submission without one, once due
+_DUE = """
+SELECT id, method, path, endpoint, body, attempts FROM outbox AS o
+WHERE state = 'pending' AND next_attempt_at <= ?
+  AND (ordering IS NULL OR id = (SELECT MIN(id) FROM outbox WHERE state = 'pending' AND ordering = o.ordering))
+ORDER BY id LIMIT ?
+"""
+
+
+@dataclass
+class OutboxEntry:
+    id: int
+    method: str
+    path: str
+    endpoint: str
+    body: bytes
+    attempts: int
+    status_code: int | None = None
+    error: str | None = None
+
+
+class Outbox:
+    """Durable queue of incident submissions, kept in a SQLite file until the API accepts them.
+
+    Submitting validates and encodes the body, stores it and returns its id; a background thread
+    delivers stored submissions with up to `concurrency` requests in flight. Submissions to an incident
+    are delivered one at a time in the order they were made. That includes its creation when the payload
+    has a dispatch ID, as the creation is then ordered by the NERIS ID `incident_key` gives it.
+
+    Connection errors, timeouts, 5xx and 429 responses, token request failures other than rejected
+    credentials, and the retryable statuses of `Config.retry` leave a submission queued, to be tried
+    again after the policy's backoff, until `max_attempts` if set. So does a 404 for a write to an
+    incident of an entity that still has a creation pending before it. Other errors mark it failed; failed submissions are listed by `failed` and requeued by
+    `retry_failed`. The outcome of each submission, delivered or failed, is passed to `on_result` as
+    a `BulkResult` whose index is the submission's id.
+
+    Submissions survive restarts, and a submission in flight when the process stopped is delivered
+    again when an outbox is next opened on the same file.
+    """
+
+    def __init__(
+        self,
+        client: "NerisApiClient",
+        path: str,
+        concurrency: int = 4,
+        max_attempts: int | None = None,
+        on_result: Callable[[BulkResult], None] | None = None,
+    ):
+        self.client = client
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.on_result = on_result
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._progress = threading.Condition()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+        self._drainer = threading.Thread(target=self._drain_in_background, daemon=True)
+        self._drainer.start()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stops delivery. Submissions not yet delivered stay in the file."""
+        self._closed.set()
+        self._wake.set()
+        self._drainer.join()
+        self._db.close()
+
+    def _submit(self, method: str, path: str, endpoint: str, body: Any, ordering: str | None) -> int:
+        # Invalid bodies are rejected now, rather than failing once they are delivered
+        encoded = self.client._encode_body(body, endpoint)
+
+        with self._lock:
+            row_id = self._db.execute(
+                "INSERT INTO outbox (method, path, endpoint, body, ordering, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (method, path, endpoint, encoded, ordering, time.time()),
+            ).lastrowid
+
+        self._wake.set()
+
+        return row_id
+
+    def create_incident(self, neris_id_entity: str, body: "str | Dict[str, Any] | IncidentPayload") -> int:
+        path = f"/incident/{neris_id_entity}"
+        encoded = self.client._encode_body(body, "create_incident")
+        key = incident_key(neris_id_entity, encoded)
+
+        # Keyed by the incident's NERIS ID, later writes to the incident are held until it is created
+        return self._submit("post", path, "create_incident", encoded, f"{path}/{key}" if _is_neris_id(key) else None)
+
+    def patch_incident(
+        self, neris_id_entity: str, neris_id_incident: str, body: "str | Dict[str, Any] | PatchIncidentAction"
+    ) -> int:
+        path = f"/incident/{neris_id_entity}/{neris_id_incident}"
+        return self._submit("patch", path, "patch_incident", body, path)
+
+    def update_incident_status(self, neris_id_entity: str, neris_id_incident: str, status: "TypeIncidentStatusValue") -> int:
+        path = f"/incident/{neris_id_entity}/{neris_id_incident}"
+        return self._submit("put", f"{path}/status", "update_incident_status", {"status": str(status)}, path)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox WHERE state = 'pending'").fetchone()[0]
+
+    def failed(self) -> List[OutboxEntry]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, method, path, endpoint, body, attempts, status_code, error FROM outbox WHERE state = 'failed' ORDER BY id"
+            ).fetchall()
+
+        return [OutboxEntry(*row) for row in rows]
+
+    def retry_failed(self) -> int:
+        with self._lock:
+            count = self._db.execute("UPDATE outbox SET state = 'pending', next_attempt_at = 0 WHERE state = 'failed'").rowcount
+
+        self._wake.set()
+
+        return count
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Waits until every pending submission is delivered or failed, and returns whether that happened in time."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._progress:
+            while self.pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+
+                if remaining is not None and remaining <= 0:
+                    return False
+
+                self._progress.wait(remaining)
+
+        return True
+
+    def _drain_in_background(self) -> None:
+        while not self._closed.is_set():
+            try:
+                self._drain_due()
+            except Exception:
+                # The thread outlives any error, or `drain` would wait forever; submissions stay in the file
+                logger.exception("Outbox delivery failed")
+                self._closed.wait(1.0)
+
+    def _drain_due(self) -> None:
+        with self._lock:
+            due = [OutboxEntry(*row) for row in self._db.execute(_DUE, (time.time(), 4 * self.concurrency))]
+
+        if not due:
+            self._wake.wait(self._until_next_attempt())
+            self._wake.clear()
+            return
+
+        for entry, result, retry in _bounded_map(self._deliver, due, self.concurrency, ordered=False):
+            self._record(entry, result, retry)
+
+        with self._progress:
+            self._progress.notify_all()
+
+    def _until_next_attempt(self) -> float | None:
+        with self._lock:
+            next_attempt_at = self._db.execute("SELECT MIN(next_attempt_at) FROM outbox WHERE state = 'pending'").fetchone()[0]
+
+        return None if next_attempt_at is None else max(next_attempt_at - time.time(), 0.0)
+
+    def _deliver(self, entry: OutboxEntry) -> Tuple[OutboxEntry, BulkResult, bool]:
+        try:
+            res = self.client._write(entry.method, entry.path, entry.body, endpoint=entry.endpoint)
+            result = self.client._bulk_result(entry.id, res)
+            retry = (
+                res.status_code >= 500
+                or res.status_code in self.client.config.retry.status_forcelist
+                or res.status_code == HTTPStatus.TOO_MANY_REQUESTS
+                or (res.status_code == HTTPStatus.NOT_FOUND and self._behind_creation(entry))
+            )
+        except Exception as e:
+            return entry, BulkResult(entry.id, error=e), isinstance(e, _TRANSIENT)
+
+        return entry, result, retry and not result.ok
+
+    def _behind_creation(self, entry: OutboxEntry) -> bool:
+        # An incident that isn't found yet may be one whose creation, submitted earlier, is still pending
+        if entry.endpoint == "create_incident":
+            return False
+
+        entity = f"/incident/{entry.path.split('/')[2]}"
+
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM outbox WHERE state = 'pending' AND endpoint = 'create_incident' AND path = ? AND id < ? LIMIT 1",
+                (entity, entry.id),
+            ).fetchone() is not None
+
+    def _record(self, entry: OutboxEntry, result: BulkResult, retry: bool) -> None:
+        attempts = entry.attempts + 1
+
+        with self._lock:
+            if result.ok:
+                self._db.execute("DELETE FROM outbox WHERE id = ?", (entry.id,))
+            elif retry and (self.max_attempts is None or attempts < self.max_attempts):
+                self._db.execute(
+                    "UPDATE outbox SET attempts = ?, next_attempt_at = ?, status_code = ?, error = ? WHERE id = ?",
+                    (attempts, time.time() + self.client.config.retry.backoff(attempts - 1), result.status_code, str(result.error), entry.id),
+                )
+                return
+            else:
+                self._db.execute(
+                    "UPDATE outbox SET state = 'failed', attempts = ?, status_code = ?, error = ? WHERE id = ?",
+                    (attempts, result.status_code, str(result.error), entry.id),
+                )
+
+        if self.on_result is not None:
+            try:
+                self.on_result(result)
+            except Exception:
+                logger.exception("Outbox on_result callback failed")
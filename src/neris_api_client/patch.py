@@ -0,0 +1,302 @@
+from functools import lru_cache
+import json
+import types
+from typing import Any, Dict, List, Tuple, Union, get_args, get_origin, TYPE_CHECKING
+
+from .endpoints import _build, _load_model
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from .models import IncidentPayload, IncidentResponse, PatchIncidentAction
+
+__all__ = ("diff_incident", "merge_patches")
+
+# Keys the API adds to responses, which are not part of payloads
+_METADATA = frozenset({"neris_id", "neris_uid", "last_modified"})
+
+Actions = Dict[str, List["type[BaseModel]"]]
+
+
+def _dump(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+    if isinstance(value, dict):
+        return {k: _dump(v) for k, v in value.items() if v is not None}
+
+    if isinstance(value, list):
+        return [_dump(v) for v in value]
+
+    return value
+
+
+def _strip(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip(v) for k, v in value.items() if k not in _METADATA}
+
+    if isinstance(value, list):
+        return [_strip(v) for v in value]
+
+    return value
+
+
+def _graft(value: Any, raw: Any) -> Any:
+    """`value` with the metadata of `raw`, the same incident before validation, put back in place."""
+    if isinstance(value, dict) and isinstance(raw, dict):
+        return {**{k: raw[k] for k in _METADATA if k in raw}, **{k: _graft(v, raw.get(k)) for k, v in value.items()}}
+
+    if isinstance(value, list) and isinstance(raw, list) and len(value) == len(raw):
+        return [_graft(v, r) for v, r in zip(value, raw)]
+
+    return value
+
+
+def _normalize(incident: Any) -> Dict[str, Any]:
+    # Both sides are validated as a payload, so coerced values, datetime formats and defaults compare equal
+    raw = _dump(incident)
+
+    return _graft(_dump(_load_model("IncidentPayload").model_validate(_strip(raw))), raw)
+
+
+@lru_cache(maxsize=None)
+def _actions(model: "type[BaseModel]", name: str) -> Tuple[Actions, Actions]:
+    """Action classes by kind allowed for a property, and for the elements of a property taking a list of actions."""
+    from pydantic import BaseModel, RootModel
+
+    single: Actions = {}
+    element: Actions = {}
+
+    def visit(annotation: Any, into: Actions) -> None:
+        origin = get_origin(annotation)
+
+        if origin in (Union, types.UnionType):
+            for arg in get_args(annotation):
+                visit(arg, into)
+        elif origin in (list, List):
+            for arg in get_args(annotation):
+                visit(arg, element)
+        elif isinstance(annotation, type) and issubclass(annotation, RootModel):
+            _build(annotation)
+            visit(annotation.model_fields["root"].annotation, into)
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel) and "action" in annotation.model_fields:
+            _build(annotation)
+            kind = get_args(annotation.model_fields["action"].annotation)[0]
+            into.setdefault(kind, []).append(annotation)
+
+    _build(model)
+    visit(model.model_fields[name].annotation, single)
+
+    return single, element
+
+
+def _properties_model(action: "type[BaseModel]") -> "type[BaseModel]":
+    model = action.model_fields["properties"].annotation
+    _build(model)
+
+    return model
+
+
+def _size(action: Any) -> int:
+    return len(json.dumps(action))
+
+
+def _diff_properties(old: Dict[str, Any], new: Dict[str, Any], model: "type[BaseModel]", path: str) -> Dict[str, Any]:
+    properties = {}
+
+    for name in sorted((old.keys() | new.keys()) - _METADATA):
+        old_value, new_value = old.get(name), new.get(name)
+
+        if _strip(old_value) == _strip(new_value):
+            continue
+
+        if name not in model.model_fields:
+            raise ValueError(f"{path}{name} cannot be patched")
+
+        properties[name] = _diff_value(old_value, new_value, *_actions(model, name), f"{path}{name}")
+
+    return properties
+
+
+def _patch(old: Any, new: Any, patches: List["type[BaseModel]"], path: str) -> Dict[str, Any]:
+    for action in patches:
+        try:
+            return {"action": "patch", "properties": _diff_properties(old, new, _properties_model(action), f"{path}.")}
+        except ValueError as e:
+            error = e
+
+    raise error
+
+
+def _diff_value(old: Any, new: Any, single: Actions, element: Actions, path: str) -> Any:
+    if element and isinstance(new, list):
+        return _diff_list(old or [], new, element, path)
+
+    if new is None:
+        if "unset" in single:
+            return {"action": "unset"}
+        if element:
+            return _diff_list(old, [], element, path)
+
+        raise ValueError(f"{path} cannot be unset")
+
+    candidates = []
+
+    if "set" in single:
+        candidates.append({"action": "set", "value": _strip(new)})
+
+    if "patch" in single and isinstance(old, dict) and isinstance(new, dict):
+        try:
+            candidates.append(_patch(old, new, single["patch"], path))
+        except ValueError:
+            if not candidates:
+                raise
+
+    if not candidates:
+        raise ValueError(f"{path} cannot be set")
+
+    return min(candidates, key=_size)
+
+
+def _diff_list(old: List[Any], new: List[Any], element: Actions, path: str) -> List[Dict[str, Any]]:
+    by_uid = {item["neris_uid"]: item for item in old if isinstance(item, dict) and item.get("neris_uid") is not None}
+
+    if len(by_uid) < len(old):
+        raise ValueError(f"{path} elements need a neris_uid to be patched or removed")
+
+    pairs = []
+    unmatched = []
+
+    # Elements carrying a neris_uid are matched to the old element with that neris_uid
+    for item in new:
+        uid = item.get("neris_uid") if isinstance(item, dict) else None
+
+        if uid in by_uid:
+            pairs.append((by_uid.pop(uid), item))
+        else:
+            unmatched.append(item)
+
+    # Then unchanged elements are matched by content, and the rest by position
+    remaining = list(by_uid.values())
+
+    for item in list(unmatched):
+        same = next((candidate for candidate in remaining if _strip(candidate) == _strip(item)), None)
+
+        if same is not None:
+            remaining.remove(same)
+            unmatched.remove(item)
+
+    while remaining and unmatched and "patch" in element:
+        pairs.append((remaining.pop(0), unmatched.pop(0)))
+
+    actions = []
+
+    for old_item, new_item in pairs:
+        if _strip(old_item) == _strip(new_item):
+            continue
+
+        try:
+            actions.append({**_patch(old_item, new_item, element["patch"], f"{path}[{old_item['neris_uid']}]"), "neris_uid": old_item["neris_uid"]})
+        except ValueError:
+            remaining.append(old_item)
+            unmatched.append(new_item)
+
+    if remaining and "remove" not in element or unmatched and "append" not in element:
+        raise ValueError(f"{path} elements cannot be removed or appended")
+
+    actions.extend({"action": "remove", "neris_uid": item["neris_uid"]} for item in remaining)
+    actions.extend({"action": "append", "value": _strip(item)} for item in unmatched)
+
+    return actions
+
+
+def diff_incident(
+    old: "IncidentPayload | IncidentResponse | Dict[str, Any]",
+    new: "IncidentPayload | Dict[str, Any]",
+    neris_id: str | None = None,
+) -> "PatchIncidentAction":
+    """Computes the smallest `PatchIncidentAction` that turns incident `old` into `new`.
+
+    `old` is normally the incident as returned by the API, whose list elements carry the
+    `neris_uid`s that patches and removals refer to. New elements are matched to old ones by
+    `neris_uid` where they carry one, then by equal content, then by position. `neris_id` defaults
+    to the one in `old`. Both incidents are validated as an `IncidentPayload` before they are compared,
+    so values that only differ in form, such as datetime formats or defaults left out, are not changes.
+    Raises `ValueError` when a change cannot be expressed as a patch.
+    """
+    old, new = _normalize(old), _normalize(new)
+    neris_id = neris_id or old.get("neris_id")
+
+    if neris_id is None:
+        raise ValueError("neris_id is required when old is not an incident returned by the API")
+
+    properties = _diff_properties(old, new, _load_model("FieldPatchIncidentActionProperties"), "")
+
+    return _load_model("PatchIncidentAction").model_validate({"neris_id": neris_id, "action": "patch", "properties": properties})
+
+
+def _apply(value: Dict[str, Any], properties: Dict[str, Any], path: str) -> Dict[str, Any]:
+    """The value set by a set action, with a later patch applied to it."""
+    value = dict(value)
+
+    for name, action in properties.items():
+        match action:
+            case {"action": "set", "value": new}:
+                value[name] = new
+            case {"action": "unset"}:
+                value.pop(name, None)
+            case {"action": "patch", "properties": nested} if isinstance(value.get(name), dict):
+                value[name] = _apply(value[name], nested, f"{path}.{name}")
+            case list() if all(element.get("action") == "append" for element in action):
+                value[name] = (value.get(name) or []) + [element["value"] for element in action]
+            case _:
+                raise ValueError(f"{path}.{name} cannot be merged")
+
+    return value
+
+
+def _merge_properties(first: Dict[str, Any], second: Dict[str, Any], path: str) -> Dict[str, Any]:
+    merged = dict(first)
+
+    for name, action in second.items():
+        merged[name] = _merge_action(first[name], action, f"{path}{name}") if name in first else action
+
+    return merged
+
+
+def _merge_action(first: Any, second: Any, path: str) -> Any:
+    match first, second:
+        case list(), list():
+            # Element actions apply in order, so later appends, removals and patches follow earlier ones
+            return first + second
+        case _, {"action": "set" | "unset"}:
+            return second
+        case {"action": "patch"}, {"action": "patch"}:
+            return {**second, "properties": _merge_properties(first["properties"], second["properties"], f"{path}.")}
+        case {"action": "set", "value": dict() as value}, {"action": "patch"}:
+            return {"action": "set", "value": _apply(value, second["properties"], path)}
+        case {"action": "set", "value": list() as value}, list() if all(element.get("action") == "append" for element in second):
+            return {"action": "set", "value": value + [element["value"] for element in second]}
+
+    raise ValueError(f"{path} cannot be merged")
+
+
+def _merge(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    if first["neris_id"] != second["neris_id"]:
+        raise ValueError("Patches of different incidents cannot be merged")
+
+    return {**second, "properties": _merge_properties(first["properties"], second["properties"], "")}
+
+
+def merge_patches(*patches: "PatchIncidentAction | Dict[str, Any]") -> "PatchIncidentAction":
+    """Merges patches of one incident into a single patch with the same effect as applying them in order.
+
+    Later set and unset actions replace earlier ones, nested patches are merged, and the element
+    actions of list properties are concatenated. Raises `ValueError` when an action cannot be
+    combined with an earlier one, such as patching a property after unsetting it.
+    """
+    merged = _dump(patches[0])
+
+    for patch in patches[1:]:
+        merged = _merge(merged, _dump(patch))
+
+    return _load_model("PatchIncidentAction").model_validate(merged)
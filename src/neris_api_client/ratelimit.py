@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List, Tuple
+
+__all__ = ("RateLimiter",)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens go negative while callers are queued, so each waits its turn instead of retrying
+            self._tokens -= 1
+
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class RateLimiter:
+    """Token bucket limiter for requests, safe to share between threads, async tasks and clients.
+
+    `rate` is the sustained requests per second across all endpoints and `burst` the number of
+    requests that may be sent at once after a quiet period. `families` adds buckets for endpoint
+    families, keyed by path prefix, e.g. `{"/incident": (10, 20)}`; a request waits for both the
+    overall bucket and the bucket of its family.
+    """
+
+    def __init__(self, rate: float | None = None, burst: int = 1, families: Dict[str, Tuple[float, int]] | None = None):
+        self._bucket = _TokenBucket(rate, burst) if rate else None
+        self._families: List[Tuple[str, _TokenBucket]] = [
+            (prefix, _TokenBucket(family_rate, family_burst))
+            for prefix, (family_rate, family_burst) in sorted((families or {}).items(), key=lambda item: -len(item[0]))
+        ]
+
+    def _delay(self, path: str) -> float:
+        delay = self._bucket.reserve() if self._bucket else 0.0
+
+        for prefix, bucket in self._families:
+            if path.startswith(prefix):
+                delay = max(delay, bucket.reserve())
+                break
+
+        return delay
+
+    def acquire(self, path: str) -> None:
+        delay = self._delay(path)
+
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, path: str) -> None:
+        delay = self._delay(path)
+
+        if delay:
+            await asyncio.sleep(delay)
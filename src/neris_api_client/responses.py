@@ -0,0 +1,120 @@
+from functools import lru_cache
+import types
+from typing import Annotated, Any, Dict, List, Tuple, Union, get_args, get_origin, TYPE_CHECKING
+
+from .endpoints import Endpoint, _build, _load_model
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel, TypeAdapter
+    from pydantic.fields import FieldInfo
+
+__all__ = ("LazyModel",)
+
+
+@lru_cache(maxsize=None)
+def _fields(model: "type[BaseModel]") -> "Dict[str, Tuple[str, FieldInfo]]":
+    _build(model)
+
+    return {name: (field.alias or name, field) for name, field in model.model_fields.items()}
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: "type[BaseModel]", name: str) -> "TypeAdapter":
+    from pydantic import TypeAdapter
+
+    field = _fields(model)[name][1]
+
+    return TypeAdapter(Annotated[field.annotation, field])
+
+
+@lru_cache(maxsize=None)
+def _nested_model(model: "type[BaseModel]", name: str) -> "Tuple[type[BaseModel] | None, bool]":
+    """The model a field holds, or a list of, once `Optional` is unwrapped."""
+    from pydantic import BaseModel
+
+    annotation = _fields(model)[name][1].annotation
+
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else annotation
+
+    many = get_origin(annotation) in (list, List)
+    if many:
+        annotation = get_args(annotation)[0]
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, many
+
+    return None, False
+
+
+class LazyModel:
+    """Read-only view of a decoded response that validates each field the first time it is read.
+
+    Fields holding models, or lists of them, are returned as `LazyModel`s in turn, so only the parts
+    of a response that are read are validated. `to_model()` validates the whole response.
+    """
+
+    __slots__ = ("_model", "_data", "_cache")
+
+    def __init__(self, model: "type[BaseModel]", data: Dict[str, Any]):
+        self._model = model
+        self._data = data
+        self._cache: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        fields = _fields(self._model)
+
+        if name not in fields:
+            raise AttributeError(f"{self._model.__name__} has no field {name!r}")
+
+        if name not in self._cache:
+            self._cache[name] = self._validate(name, *fields[name])
+
+        return self._cache[name]
+
+    def _validate(self, name: str, key: str, field: "FieldInfo") -> Any:
+        if key not in self._data:
+            if field.is_required():
+                # Raises the same error as eager validation would
+                self._model.model_validate(self._data)
+
+            return field.get_default(call_default_factory=True)
+
+        value = self._data[key]
+        nested, many = _nested_model(self._model, name)
+
+        match value:
+            case dict() if nested and not many:
+                return LazyModel(nested, value)
+            case list() if nested and many and all(isinstance(item, dict) for item in value):
+                return [LazyModel(nested, item) for item in value]
+
+        return _field_adapter(self._model, name).validate_python(value)
+
+    def to_model(self) -> "BaseModel":
+        return self._model.model_validate(self._data)
+
+    def __repr__(self) -> str:
+        return f"LazyModel({self._model.__name__})"
+
+
+def decode_response(endpoint: Endpoint, content: bytes, lazy: bool = False) -> Any:
+    """Decodes a response body with the endpoint's response model, straight from the JSON bytes."""
+    if not lazy:
+        validator = endpoint.response_validator()
+
+        if endpoint.response_many:
+            return validator.validate_json(content)
+
+        return validator.model_validate_json(content)
+
+    from pydantic_core import from_json
+
+    model = _load_model(endpoint.response_model)
+    got = from_json(content)
+
+    if endpoint.response_many:
+        return [LazyModel(model, item) for item in got]
+
+    return LazyModel(model, got)
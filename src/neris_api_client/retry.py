@@ -0,0 +1,77 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import threading
+from typing import Dict, FrozenSet, Mapping
+
+__all__ = ("RetryPolicy", "RetryStats")
+
+
+@dataclass
+class RetryPolicy:
+    total: int = 3
+    backoff_factor: float = 0.5
+    backoff_max: float = 30.0
+    jitter: bool = True
+    status_forcelist: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    allowed_methods: FrozenSet[str] = frozenset({"get", "head", "options", "put", "delete"})
+    respect_retry_after: bool = True
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait before retry number `attempt + 1`, never more than `backoff_max`."""
+        # Capped, so that a server asking for hours doesn't block the caller inside a request
+        if retry_after is not None and self.respect_retry_after:
+            return min(retry_after, self.backoff_max)
+
+        delay = min(self.backoff_factor * 2 ** attempt, self.backoff_max)
+
+        # Full jitter spreads retries from many clients over the whole backoff window
+        return random.uniform(0, delay) if self.jitter else delay
+
+    @staticmethod
+    def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+        value = headers.get("Retry-After")
+
+        if value is None:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    attempts: int = 0
+    retries: Dict[int | str, int] = field(default_factory=dict)
+    exhausted: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def amplification(self) -> float:
+        """Attempts sent per request made, 1.0 when nothing was retried."""
+        return self.attempts / self.requests if self.requests else 1.0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_attempt(self) -> None:
+        with self._lock:
+            self.attempts += 1
+
+    def record_retry(self, reason: int | str) -> None:
+        with self._lock:
+            self.retries[reason] = self.retries.get(reason, 0) + 1
+
+    def record_exhausted(self) -> None:
+        with self._lock:
+            self.exhausted += 1
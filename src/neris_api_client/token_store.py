@@ -0,0 +1,113 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterator
+
+from .config import TokenSet
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+__all__ = ("TokenStore", "MemoryTokenStore", "FileTokenStore")
+
+
+def _replace_json(path: str, data: Any) -> None:
+    # Write to a private temporary file and swap it in so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class TokenStore(ABC):
+    """Storage for token sets, keyed by API and credentials, that can be shared by several clients.
+
+    Clients take `lock` around reading a token set and refreshing it, so that only one client
+    holding the store refreshes at a time and the rest pick up the tokens it saved.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> TokenSet | None: ...
+
+    @abstractmethod
+    def save(self, key: str, tokens: TokenSet) -> None: ...
+
+    @abstractmethod
+    def lock(self, key: str) -> Iterator[None]: ...
+
+
+class MemoryTokenStore(TokenStore):
+    def __init__(self):
+        self._tokens: Dict[str, TokenSet] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> TokenSet | None:
+        return self._tokens.get(key)
+
+    def save(self, key: str, tokens: TokenSet) -> None:
+        self._tokens[key] = tokens
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with self._lock:
+            yield
+
+
+class FileTokenStore(TokenStore):
+    """Stores token sets in a JSON file guarded by an OS file lock, for sharing between processes on one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def load(self, key: str) -> TokenSet | None:
+        got = self._read().get(key)
+
+        if got is None:
+            return None
+
+        return TokenSet(
+            access_token=got["access_token"],
+            refresh_token=got["refresh_token"],
+            expires_at=datetime.fromisoformat(got["expires_at"]),
+        )
+
+    def save(self, key: str, tokens: TokenSet) -> None:
+        stored = self._read()
+        stored[key] = {
+            "access_token": tokens.access_token,
+            "refresh_token": tokens.refresh_token,
+            "expires_at": tokens.expires_at.isoformat(),
+        }
+
+        _replace_json(self.path, stored)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with self._lock, open(f"{self.path}.lock", "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,92 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, TYPE_CHECKING
+
+from .client import _bounded_map
+from .endpoints import _load_model
+
+if TYPE_CHECKING:
+    from .models import HTTPValidationError
+
+__all__ = ("RecordError", "validate_incidents", "validate_jsonl")
+
+
+@dataclass
+class RecordError:
+    """Validation errors of one record, with `detail` in the shape of the API's `ValidationError`."""
+
+    index: int
+    detail: List[Dict[str, Any]]
+
+    def to_model(self) -> "HTTPValidationError":
+        return _load_model("HTTPValidationError").model_validate({"detail": self.detail})
+
+
+def _validate_chunk(chunk: Tuple[str, List[Tuple[int, str | bytes | Dict[str, Any]]]]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    from pydantic import ValidationError
+
+    model_name, records = chunk
+    model = _load_model(model_name)
+    errors = []
+
+    for index, record in records:
+        try:
+            if isinstance(record, (str, bytes)):
+                model.model_validate_json(record)
+            else:
+                model.model_validate(record)
+        except ValidationError as e:
+            # Only what the API reports is sent back, to keep the results cheap to pass between processes
+            errors.append(
+                (index, [{"loc": list(error["loc"]), "msg": error["msg"], "type": error["type"]} for error in e.errors(include_url=False)])
+            )
+
+    return errors
+
+
+def _chunks(records: Iterable[Tuple[int, Any]], model: str, chunksize: int) -> Iterator[Tuple[str, List[Tuple[int, Any]]]]:
+    records = iter(records)
+
+    while chunk := list(islice(records, chunksize)):
+        yield model, chunk
+
+
+def _validate(records: Iterable[Tuple[int, Any]], model: str, processes: int | None, chunksize: int) -> Iterator[RecordError]:
+    processes = processes or os.cpu_count() or 1
+    chunks = _chunks(records, model, chunksize)
+
+    if processes == 1:
+        results = map(_validate_chunk, chunks)
+    else:
+        results = _bounded_map(_validate_chunk, chunks, processes, executor=ProcessPoolExecutor)
+
+    for errors in results:
+        for index, detail in errors:
+            yield RecordError(index, detail)
+
+
+def validate_incidents(
+    records: Iterable[str | bytes | Dict[str, Any]],
+    processes: int | None = None,
+    chunksize: int = 256,
+    model: str = "IncidentPayload",
+) -> Iterator[RecordError]:
+    """Validates records against `model` across a pool of processes, yielding a `RecordError` per invalid record.
+
+    Records may be JSON strings or dicts, and are validated in chunks of `chunksize` to amortize the cost of
+    passing them between processes. Errors are yielded in input order, with `index` the position of the record.
+    """
+    return _validate(enumerate(records), model, processes, chunksize)
+
+
+def validate_jsonl(
+    path: str,
+    processes: int | None = None,
+    chunksize: int = 256,
+    model: str = "IncidentPayload",
+) -> Iterator[RecordError]:
+    """Validates a JSON lines file like `validate_incidents`, with `index` the zero-based line number of the record."""
+    with open(path, "rb") as f:
+        yield from _validate(((number, line) for number, line in enumerate(f) if line.strip()), model, processes, chunksize)